@@ -0,0 +1,335 @@
+"""Bounded buffers shared between producer and consumer threads.
+
+BoundedBuffer is the classic bounded-buffer monitor: a deque guarded by one
+lock and two conditions (not_full / not_empty), the same machinery
+queue.Queue uses internally. It drops queue.Queue's task_done/join
+bookkeeping, which the simulation never used but paid a lock acquisition
+for, and it moves whole batches per lock acquisition while reporting the
+occupancy it observed, so callers never need qsize() to log "Buffer: X -> Y".
+
+RingBuffer is the single-producer/single-consumer fast path (Lamport's SPSC
+queue): a power-of-two list indexed by two monotonically increasing counters,
+each written by exactly one side. Under the GIL a list slot store and an
+attribute store are atomic, so the hot path takes no lock at all; threads
+only fall back to an Event when the buffer stays full or empty. It requires
+the GIL: without it nothing orders the slot store before the counter store
+that publishes it, so SimulationManager never picks it on a free-threaded
+interpreter running with the GIL disabled.
+
+UnboundedBuffer drops backpressure altogether for callers that do not need
+it: it wraps queue.SimpleQueue, whose put/get are a single C-level lock
+acquisition each.
+"""
+
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, List, Sequence, Tuple, Union
+
+# Default for get_many(): no item ends a batch early
+_NO_SENTINEL = object()
+
+# RingBuffer: how many times to yield the GIL before parking on an Event
+_SPIN_LIMIT = 16
+
+
+class BoundedBuffer:
+    """Blocking FIFO with a fixed capacity and batched put/get."""
+
+    def __init__(self, maxsize: int):
+        """
+        Initialize an empty buffer.
+
+        Args:
+            maxsize: Maximum number of items held at once (must be > 0).
+        """
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be greater than 0, got {maxsize}")
+        self.maxsize = maxsize
+        self._items: deque = deque()
+        # One lock, two wait queues: producers park on not_full, consumers on not_empty
+        self._mutex = threading.Lock()
+        self._not_full = threading.Condition(self._mutex)
+        self._not_empty = threading.Condition(self._mutex)
+
+    def qsize(self) -> int:
+        """Return the current number of buffered items (takes the lock)."""
+        with self._mutex:
+            return len(self._items)
+
+    def clear(self) -> None:
+        """Drop every buffered item so the buffer can be reused for a new run."""
+        with self._mutex:
+            self._items.clear()
+            self._not_full.notify_all()
+
+    def put(self, item: Any) -> None:
+        """Block until a slot is free, then enqueue ``item``."""
+        self.put_many((item,))
+
+    def get(self) -> Any:
+        """Block until an item is available, then dequeue and return it."""
+        return self.get_many(1)[0][0]
+
+    def put_many(self, items: Sequence[Any]) -> int:
+        """
+        Block until there is room for every item, then enqueue them in one go.
+
+        The batch is inserted atomically, so item ``i`` moved the buffer from
+        ``before + i`` to ``before + i + 1``.
+
+        Args:
+            items: Items to enqueue; must not exceed the buffer capacity.
+
+        Returns:
+            The buffer size just before the batch was inserted.
+        """
+        count = len(items)
+        if count > self.maxsize:
+            raise ValueError(f"batch of {count} items exceeds buffer capacity {self.maxsize}")
+        with self._not_full:
+            while len(self._items) + count > self.maxsize:
+                self._not_full.wait()
+            before = len(self._items)
+            self._items.extend(items)
+            self._not_empty.notify(count)
+            return before
+
+    def get_many(self, max_items: int, sentinel: Any = _NO_SENTINEL) -> Tuple[List[Any], int]:
+        """
+        Block until at least one item is available, then dequeue up to ``max_items``.
+
+        Args:
+            max_items: Upper bound on the batch size.
+            sentinel: If dequeued, the batch ends right after it so one caller
+                never swallows a stop signal meant for another.
+
+        Returns:
+            (items, before) where item ``i`` moved the buffer from
+            ``before - i`` to ``before - i - 1``.
+        """
+        with self._not_empty:
+            while not self._items:
+                self._not_empty.wait()
+            before = len(self._items)
+            popleft = self._items.popleft
+            items = []
+            for _ in range(min(before, max_items)):
+                item = popleft()
+                items.append(item)
+                if item is sentinel:
+                    break
+            self._not_full.notify(len(items))
+            return items, before
+
+
+class RingBuffer:
+    """
+    Lock-free bounded FIFO for exactly one producer and one consumer thread.
+
+    Same put/get/put_many/get_many interface as BoundedBuffer. The "before"
+    sizes it reports are the occupancy the calling side observed; the other
+    side may move concurrently, which only affects the logged trace.
+    """
+
+    def __init__(self, maxsize: int):
+        """
+        Initialize an empty ring.
+
+        Args:
+            maxsize: Maximum number of items held at once (must be > 0). The
+                backing list is rounded up to a power of two so wrap-around
+                is a bit mask instead of a modulo.
+        """
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be greater than 0, got {maxsize}")
+        self.maxsize = maxsize
+        capacity = 1 << (maxsize - 1).bit_length()
+        self._mask = capacity - 1
+        self._slots: List[Any] = [None] * capacity
+        # _tail is only written by the producer, _head only by the consumer
+        self._head = 0
+        self._tail = 0
+        # Slow-path wake-ups once spinning gives up
+        self._data_ready = threading.Event()
+        self._space_ready = threading.Event()
+
+    def qsize(self) -> int:
+        """Return the current number of buffered items (a lock-free snapshot)."""
+        return self._tail - self._head
+
+    def clear(self) -> None:
+        """
+        Reset to empty so the ring can be reused for a new run.
+
+        Only call this while no producer or consumer thread is using the ring.
+        """
+        self._slots[:] = [None] * len(self._slots)
+        self._head = self._tail = 0
+        self._data_ready.clear()
+        self._space_ready.clear()
+
+    def put(self, item: Any) -> None:
+        """Block until a slot is free, then enqueue ``item``."""
+        self.put_many((item,))
+
+    def get(self) -> Any:
+        """Block until an item is available, then dequeue and return it."""
+        return self.get_many(1)[0][0]
+
+    def put_many(self, items: Sequence[Any]) -> int:
+        """
+        Block until there is room for every item, then publish them in one go.
+
+        Args:
+            items: Items to enqueue; must not exceed the buffer capacity.
+
+        Returns:
+            The buffer size the producer saw just before inserting the batch.
+        """
+        count = len(items)
+        if count > self.maxsize:
+            raise ValueError(f"batch of {count} items exceeds buffer capacity {self.maxsize}")
+        limit = self.maxsize - count
+        tail = self._tail
+        spins = 0
+        while tail - self._head > limit:
+            if spins < _SPIN_LIMIT:
+                spins += 1
+                time.sleep(0)
+                continue
+            # Clear, then re-check: a get_many that frees space after the
+            # check below is guaranteed to see the cleared flag and set it.
+            self._space_ready.clear()
+            if tail - self._head > limit:
+                self._space_ready.wait()
+        before = tail - self._head
+        slots, mask = self._slots, self._mask
+        for offset, item in enumerate(items, tail):
+            slots[offset & mask] = item
+        # Publishing the new tail is what makes the batch visible
+        self._tail = tail + count
+        if not self._data_ready.is_set():
+            self._data_ready.set()
+        return before
+
+    def get_many(self, max_items: int, sentinel: Any = _NO_SENTINEL) -> Tuple[List[Any], int]:
+        """
+        Block until at least one item is available, then dequeue up to ``max_items``.
+
+        Args:
+            max_items: Upper bound on the batch size.
+            sentinel: If dequeued, the batch ends right after it.
+
+        Returns:
+            (items, before) where ``before`` is the occupancy the consumer saw.
+        """
+        head = self._head
+        spins = 0
+        while self._tail == head:
+            if spins < _SPIN_LIMIT:
+                spins += 1
+                time.sleep(0)
+                continue
+            self._data_ready.clear()
+            if self._tail == head:
+                self._data_ready.wait()
+        before = self._tail - head
+        slots, mask = self._slots, self._mask
+        items = []
+        for position in range(head, head + min(before, max_items)):
+            index = position & mask
+            item = slots[index]
+            # Drop the reference so the ring never keeps consumed items alive
+            slots[index] = None
+            items.append(item)
+            if item is sentinel:
+                break
+        self._head = head + len(items)
+        if not self._space_ready.is_set():
+            self._space_ready.set()
+        return items, before
+
+
+class UnboundedBuffer:
+    """
+    FIFO without a capacity limit, backed by queue.SimpleQueue.
+
+    Same put/get/put_many/get_many interface as BoundedBuffer. put never
+    blocks. The "before" sizes come from SimpleQueue.qsize(), which takes no
+    lock, so they are a snapshot that other threads may already have moved.
+    """
+
+    # No capacity: producers still batch, but never wait for room
+    maxsize = sys.maxsize
+
+    def __init__(self):
+        """Initialize an empty buffer."""
+        self._queue = queue.SimpleQueue()
+
+    def qsize(self) -> int:
+        """Return the approximate number of buffered items."""
+        return self._queue.qsize()
+
+    def clear(self) -> None:
+        """Drop every buffered item so the buffer can be reused for a new run."""
+        get_nowait = self._queue.get_nowait
+        try:
+            while True:
+                get_nowait()
+        except queue.Empty:
+            pass
+
+    def put(self, item: Any) -> None:
+        """Enqueue ``item`` (never blocks)."""
+        self._queue.put(item)
+
+    def get(self) -> Any:
+        """Block until an item is available, then dequeue and return it."""
+        return self._queue.get()
+
+    def put_many(self, items: Sequence[Any]) -> int:
+        """
+        Enqueue every item in order.
+
+        Returns:
+            The buffer size observed just before the batch was inserted.
+        """
+        before = self._queue.qsize()
+        put = self._queue.put
+        for item in items:
+            put(item)
+        return before
+
+    def get_many(self, max_items: int, sentinel: Any = _NO_SENTINEL) -> Tuple[List[Any], int]:
+        """
+        Block until one item is available, then take up to ``max_items`` without waiting.
+
+        Args:
+            max_items: Upper bound on the batch size.
+            sentinel: If dequeued, the batch ends right after it.
+
+        Returns:
+            (items, before) where ``before`` is the occupancy observed.
+        """
+        item = self._queue.get()
+        before = self._queue.qsize() + 1
+        items = [item]
+        if item is sentinel:
+            return items, before
+        get_nowait = self._queue.get_nowait
+        try:
+            for _ in range(max_items - 1):
+                item = get_nowait()
+                items.append(item)
+                if item is sentinel:
+                    break
+        except queue.Empty:
+            pass
+        return items, before
+
+
+# Anything Producer/Consumer can share: all expose the same batched interface
+SharedBuffer = Union[BoundedBuffer, RingBuffer, UnboundedBuffer]
@@ -8,8 +8,13 @@ from datetime import datetime
 from .core import SimulationManager
 from .utils import setup_logging
 
-def parse_args():
-    """Wire up the CLI switches for batch-friendly runs."""
+# Whether a human is at the keyboard. This cannot change while the process
+# runs, so check once instead of issuing an isatty() syscall at every prompt.
+# sys.stdin is None when there is no console at all (pythonw, some services).
+_INTERACTIVE = sys.stdin is not None and sys.stdin.isatty()
+
+def _build_argparser() -> argparse.ArgumentParser:
+    """Build the CLI parser; it only depends on the code, not on argv."""
     parser = argparse.ArgumentParser(
         description="Producer-Consumer Simulation - Demonstrates thread synchronization",
         epilog="""
@@ -23,7 +28,18 @@ def parse_args():
     parser.add_argument("--producers", type=int, help="Number of producer threads (allowed range: 1-100)")
     parser.add_argument("--consumers", type=int, help="Number of consumer threads (allowed range: 1-100)")
     parser.add_argument("--save-logs", action="store_true", help="Automatically save simulation logs to a dated .txt file")
-    return parser.parse_args()
+    return parser
+
+# Built once at import and reused by every parse_args() call
+_PARSER = _build_argparser()
+
+def parse_args(argv=None):
+    """Wire up the CLI switches for batch-friendly runs.
+    
+    Args:
+        argv: Arguments to parse (default: sys.argv[1:])
+    """
+    return _PARSER.parse_args(argv)
 
 def get_valid_input(prompt: str, min_value: int = 1, max_value: int = None) -> int:
     """Prompt until we receive an integer inside the allowed range.
@@ -36,7 +52,7 @@ def get_valid_input(prompt: str, min_value: int = 1, max_value: int = None) -> i
     Returns:
         Valid integer within the specified range
     """
-    if not sys.stdin.isatty():
+    if not _INTERACTIVE:
         raise EOFError("Interactive input not available. Use: --items <number> --capacity <number>")
     
     # Build range string for prompt
@@ -64,15 +80,17 @@ def get_valid_input(prompt: str, min_value: int = 1, max_value: int = None) -> i
 def display_timestamp_ordered_logs(log_handler) -> None:
     """Print captured logs in chronological order for easier reading."""
     sorted_logs = log_handler.get_sorted_logs()
+    if not sorted_logs:
+        return
     
-    formatter = logging.Formatter("[%(threadName)s] - %(levelname)s - %(message)s")
-    for record in sorted_logs:
-        print(formatter.format(record))
+    # One write for the whole report instead of a print() (and a TTY flush) per line
+    format_record = logging.Formatter("[%(threadName)s] - %(levelname)s - %(message)s").format
+    sys.stdout.write("\n".join(map(format_record, sorted_logs)) + "\n")
 
 
 def maybe_save_logs(log_handler, *, auto_save: bool = False) -> None:
     """Persist the current log stream to disk if requested."""
-    if not auto_save and not sys.stdin.isatty():
+    if not auto_save and not _INTERACTIVE:
         return
 
     if not auto_save:
@@ -95,21 +113,22 @@ def maybe_save_logs(log_handler, *, auto_save: bool = False) -> None:
     filename = f"{now.day:02d}.txt"
     filepath = os.path.join(dated_dir, filename)
 
-    formatter = logging.Formatter("[%(threadName)s] - %(levelname)s - %(message)s")
+    format_record = logging.Formatter("[%(threadName)s] - %(levelname)s - %(message)s").format
+    lines = [format_record(record) + os.linesep for record in log_handler.get_sorted_logs()]
     with open(filepath, "w", encoding="utf-8") as logfile:
-        for record in log_handler.get_sorted_logs():
-            logfile.write(formatter.format(record) + os.linesep)
+        logfile.write("".join(lines))
 
     print(f"File stored successfully in folder {dated_dir}")
 
-def run_simulation():
-    """Run a single simulation iteration."""
-    # Replace any existing handlers so we have a clean capture for this run
-    root_logger = logging.getLogger()
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
+def run_simulation(args, log_handler) -> bool:
+    """Run a single simulation iteration.
     
-    log_handler = setup_logging()
+    Args:
+        args: Parsed command-line arguments (parsed once by main()).
+        log_handler: The capture handler installed by main(); emptied here so
+            each run starts from a clean capture.
+    """
+    log_handler.clear_logs()
     logger = logging.getLogger("Main")
     
     print("=" * 60)
@@ -133,8 +152,6 @@ def run_simulation():
     print("-" * 60)
     print()
     
-    args = parse_args()
-    
     if args.items is not None and args.capacity is not None:
         n_items = args.items
         capacity = args.capacity
@@ -185,7 +202,7 @@ def run_simulation():
         return False
     
     try:
-        results = manager.run()
+        manager.run()
     except Exception as e:
         print(f"Error: Simulation failed - {e}")
         logger.exception("Simulation error occurred")
@@ -197,13 +214,13 @@ def run_simulation():
     print()
     print("=== Simulation Complete ===")
     print(f"Items Produced: {n_items}")
-    print(f"Items Consumed: {len(results)}")
+    print(f"Items Consumed: {manager.items_consumed}")
     
-    if len(results) == n_items:
+    if manager.items_consumed == n_items:
         print("SUCCESS: All items processed successfully.")
     else:
         print("FAILURE: Item count mismatch!")
-        logger.warning(f"Item count mismatch: expected {n_items}, got {len(results)}")
+        logger.warning(f"Item count mismatch: expected {n_items}, got {manager.items_consumed}")
 
     maybe_save_logs(log_handler, auto_save=args.save_logs)
     
@@ -211,11 +228,20 @@ def run_simulation():
 
 def main():
     """Main entry point with run-again loop."""
+    # argv and the logging setup cannot change between runs, so do both once
+    args = parse_args()
+    
+    # Replace any existing handlers so the capture handler sees every record
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+    log_handler = setup_logging()
+    
     try:
         while True:
-            success = run_simulation()
+            success = run_simulation(args, log_handler)
             
-            if not sys.stdin.isatty():
+            if not _INTERACTIVE:
                 # Non-interactive shell (e.g., CLI flags or CI) should exit immediately
                 return 0 if success else 1
             
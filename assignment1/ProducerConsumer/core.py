@@ -1,34 +1,94 @@
-"""Concurrent producer-consumer simulation built on top of queue.Queue.
+"""Concurrent producer-consumer simulation built on top of a bounded buffer.
 
-queue.Queue already wraps a lock/condition pair, so we get blocking put/get
-behavior. This module layers logging, sequencing, and thread
-coordination so multiple producers and consumers can share the buffer safely.
+BoundedBuffer (see buffers.py) wraps a lock/condition pair, so we get blocking
+put/get behavior. A 1-producer/1-consumer run uses the lock-free RingBuffer
+instead. This module layers logging, sequencing, and thread coordination so
+multiple producers and consumers can share the buffer safely.
 """
 
+import sys
 import threading
-import queue
 import logging
-from typing import List, Optional
+import time
+from operator import itemgetter
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+from .buffers import BoundedBuffer, RingBuffer, SharedBuffer, UnboundedBuffer
+from .core_mp import run_processes
 from .models import WorkItem
 
-STOP_SIGNAL = None
+# Unique identity, so it can never collide with a real payload (or with None)
+STOP_SIGNAL = object()
+
+# Upper bound on items moved per lock acquisition in put_many/get_many
+BATCH_SIZE = 64
+
+# Execution backends for SimulationManager
+BACKEND_THREADING = "threading"
+BACKEND_MULTIPROCESSING = "multiprocessing"
+_BACKENDS = (BACKEND_THREADING, BACKEND_MULTIPROCESSING)
+
+
+def _gil_enabled() -> bool:
+    """False only on a free-threaded build (3.13t) running with the GIL off."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is None or is_gil_enabled()
+
+
+# Only bare item ids travel through the queue. An item's sequence number is
+# its position in the original 1..N stream (item_id - 1), fixed up front by
+# _distribute_items, so it never needs to be generated or carried at runtime.
+# WorkItem objects are only built once, after the run (see results_as_workitems).
+
+# Trace events recorded by the worker threads instead of logging inline:
+# (perf_counter_ns, thread_name, kind, item_id, buffer_before, buffer_after)
+Event = Tuple[int, str, str, Optional[int], Optional[int], Optional[int]]
+
+EVENT_STARTED = "started"
+EVENT_PRODUCED = "produced"
+EVENT_FINISHED = "finished"
+EVENT_CONSUMED = "consumed"
+EVENT_STOPPED = "stopped"
+
+
+# Log message templates for the replayed trace. They are %-style so a record
+# is only rendered if a handler actually formats it. The id column keeps the
+# width of "WorkItem(id=NN)" aligned via a computed "%*s" pad.
+_ITEM_MSG = "%s WorkItem(id=%d)%*s  |  Buffer: %d -> %d"
+_STOP_MSG = "Received STOP_SIGNAL. Quitting.  |  Buffer: %d -> %d"
+_VERBS = {EVENT_PRODUCED: "Produced", EVENT_CONSUMED: "Consumed"}
+_NO_ARGS = ()
+
+
+def _event_message(kind: str, item_id: Optional[int], buffer_before: Optional[int],
+                   buffer_after: Optional[int]) -> Tuple[str, tuple]:
+    """Return the (msg, args) pair a recorded trace event is logged with."""
+    verb = _VERBS.get(kind)
+    if verb is not None:
+        # Pad single-digit ids to the width of a two-digit one
+        pad = 1 if item_id < 10 else 0
+        return _ITEM_MSG, (verb, item_id, pad, "", buffer_before, buffer_after)
+    if kind == EVENT_STOPPED:
+        return _STOP_MSG, (buffer_before, buffer_after)
+    if kind == EVENT_FINISHED:
+        return "Finished production", _NO_ARGS
+    return "Starting", _NO_ARGS
 
 class Producer(threading.Thread):
-    """Feeds the shared queue with WorkItems while preserving global order."""
+    """Feeds the shared queue with its chunk of item ids."""
     
-    def __init__(self, source_ids: List[int], shared_queue: queue.Queue, 
-                 sequence_counter: Optional[threading.Lock] = None,
-                 sequence_value: Optional[List[int]] = None,
-                 name: str = "Producer"):
+    def __init__(self, source_ids: Sequence[int], shared_queue: SharedBuffer, 
+                 name: str = "Producer", trace: bool = True,
+                 on_finished: Optional[Callable[[], None]] = None):
         """
         Initialize the Producer thread.
         
         Args:
-            source_ids: The list of raw integers this specific producer is responsible for processing.
-            shared_queue: The thread-safe buffer where processed WorkItems are placed.
-            sequence_counter: A shared Lock to ensure only one thread updates the global sequence at a time.
-            sequence_value: A shared mutable list (acting as a pointer) holding the current global sequence number.
+            source_ids: The raw integers (typically a range) this specific producer is responsible for processing.
+            shared_queue: The thread-safe buffer where item ids are placed.
             name: A human-readable identifier for this thread (e.g., "Producer-1").
+            trace: Record per-item trace events. When off, nothing is recorded.
+            on_finished: Called once on this thread when the chunk is done (see
+                SimulationManager.run, which uses it to post the STOP signals).
         """
         # CRITICAL: Initialize the parent Thread class first.
         # This sets up the internal thread state so .start() and .join() work correctly.
@@ -37,75 +97,96 @@ class Producer(threading.Thread):
         
         self.source_ids = source_ids
         self.shared_queue = shared_queue
-        self.sequence_counter = sequence_counter  # Guards the shared sequence counter
-        self.sequence_value = sequence_value  # Mutable single-value store for the counter
-        self.logger = logging.getLogger(__name__)
+        self._trace = trace
+        self._on_finished = on_finished
+        # Thread-private trace buffer; drained by the manager after join()
+        self._events: List[Event] = []
 
     def run(self) -> None:
         """
         The main execution loop for the Producer thread.
         
-        1. Iterates through its assigned 'source_ids'.
-        2. Acquires a global lock to generate a unique sequence number.
-        3. Wraps the data into a 'WorkItem'.
-        4. Places the item into the 'shared_queue'.
+        1. Walks its assigned 'source_ids' in batches of up to BATCH_SIZE.
+           Sequence numbers were assigned up front, so there is no shared
+           counter to synchronize on.
+        2. Places the whole batch into the 'shared_queue' in one lock acquisition.
            - IMPORTANT: This is a BLOCKING operation.
-           - If the queue is full, this thread sleeps until space is available.
+           - If the queue lacks room for the batch, this thread sleeps until it has.
+        3. Records trace events (plain tuples: no formatting, no logging lock),
+           unless tracing is off.
+        4. Calls 'on_finished', if given.
         """
-        self.logger.info("Starting")
-        for item_id in self.source_ids:
-            # STEP 1: Generate Global Sequence Number
-            # We use a Lock (sequence_counter) to ensure no two threads grab the same number.
+        # Hoist every attribute and global the loop touches into locals: each
+        # LOAD_ATTR/LOAD_GLOBAL avoided is paid once per run, not once per batch.
+        record = self._events.append
+        record_many = self._events.extend
+        put_many = self.shared_queue.put_many
+        perf_counter_ns = time.perf_counter_ns
+        produced = EVENT_PRODUCED
+        name = self.name
+        trace = self._trace
+        if trace:
+            record((perf_counter_ns(), name, EVENT_STARTED, None, None, None))
+        
+        try:
+            source_ids = self.source_ids
             
-            if self.sequence_counter and self.sequence_value:
-                with self.sequence_counter:
-                    seq_num = self.sequence_value[0]
-                    self.sequence_value[0] += 1
-            else:
-                seq_num = 0  # Fallback path when sequence bookkeeping is disabled
+            # A batch must fit in the buffer, so tiny capacities mean tiny batches
+            batch_size = min(BATCH_SIZE, self.shared_queue.maxsize)
+            for start in range(0, len(source_ids), batch_size):
+                # STEP 1: Take the Next Batch of Ids
+                # Slicing a range gives a range: the batch costs no allocation at all.
+                batch = source_ids[start:start + batch_size]
             
-            # STEP 2: Create Immutable Work Item
-            item = WorkItem(item_id, sequence_number=seq_num)
+                # STEP 2: Add to Shared Buffer (Critical Synchronization Point)
+                # BLOCKS until the whole batch fits (Internally calls not_full.wait()).
+                # The Producer thread will pause here if the Consumer is too slow.
+                # One lock round-trip covers the batch, and the returned size lets us
+                # reconstruct each item's exact buffer transition without qsize().
+                buffer_size = put_many(batch)
             
-            # STEP 3: Add to Shared Buffer (Critical Synchronization Point)
-            # BLOCKS if full (Internally calls not_full.wait() to release lock)
-            # The Producer thread will pause here if the Consumer is too slow.
-            self.shared_queue.put(item)
+                if trace:
+                    now = perf_counter_ns()
+                    # enumerate() yields each item's buffer size before it was added
+                    record_many([(now, name, produced, item_id, size, size + 1)
+                                 for size, item_id in enumerate(batch, buffer_size)])
             
-            # Logging state for debugging
-            buffer_after = self.shared_queue.qsize()
-            buffer_before = buffer_after - 1  # Derive the before-state while we hold the slot
-            # Pad single-digit IDs for nicer log alignment
-            spacing = "   " if item_id < 10 else "  "
-            self.logger.info(
-                f"Produced WorkItem(id={item.item_id}){spacing}|  Buffer: {buffer_before} -> {buffer_after}"
-            )
-        
-        self.logger.info("Finished production")
+            if trace:
+                record((perf_counter_ns(), name, EVENT_FINISHED, None, None, None))
+        finally:
+            # The last producer to finish tells the consumers to stop. Running
+            # this even on error keeps consumers from waiting forever.
+            if self._on_finished is not None:
+                self._on_finished()
         # Note: This producer is done, but the Consumers might still be working.
-        # We don't stop them here; the Manager handles that coordination.
+        # Only the last producer to finish (via on_finished) stops them.
 
 class Consumer(threading.Thread):
-    """Drains WorkItems from the shared queue into a private buffer."""
+    """Drains item ids from the shared queue into a shared, pre-sized destination."""
     
-    def __init__(self, shared_queue: queue.Queue, name: str = "Consumer"):
+    def __init__(self, shared_queue: SharedBuffer, destination: List[Optional[int]],
+                 name: str = "Consumer", trace: bool = True):
         """
         Initialize the Consumer thread.
         
         Args:
-            shared_queue: The common buffer to read WorkItems from.
+            shared_queue: The common buffer to read item ids from.
+            destination: Pre-sized list shared by all consumers; slot N receives the
+                item with sequence number N (item id N + 1).
             name: Identifier for logs (e.g., "Consumer-1").
+            trace: Record per-item trace events. When off, nothing is recorded.
         """
         # Initialize the parent thread to set up threading machinery
         super().__init__(name=name)
         
         self.shared_queue = shared_queue
-        self.local_destination: List[WorkItem] = []  # Local buffer keeps locking simple
-        self.logger = logging.getLogger(__name__)
-    
-    def get_destination(self) -> List[WorkItem]:
-        """Expose the items consumed by this thread."""
-        return self.local_destination
+        # Item ids are unique, so no two consumers ever write the same
+        # slot: the shared list needs no lock and never has to grow.
+        self.destination = destination
+        self.consumed_count = 0
+        self._trace = trace
+        # Thread-private trace buffer; drained by the manager after join()
+        self._events: List[Event] = []
 
     def run(self) -> None:
         """
@@ -114,47 +195,116 @@ class Consumer(threading.Thread):
         This loop runs indefinitely until it receives a specific 'Sentinel' (STOP_SIGNAL).
         
         Workflow:
-        1. Wait for an item in the queue (Blocking).
-        2. Check if it is the STOP_SIGNAL.
-        3. If real item, process it (store in local list).
-        4. Signal the queue that work is done (task_done).
+        1. Wait for items in the queue and take up to BATCH_SIZE at once (Blocking).
+        2. Check each one for the STOP_SIGNAL.
+        3. If real item, process it (store it in its sequence slot).
         """
-        self.logger.info("Starting")
-        while True:
-            # STEP 1: Retrieve Item (Blocking)
+        # Hoisted into locals once, as in Producer.run
+        record = self._events.append
+        get_many = self.shared_queue.get_many
+        perf_counter_ns = time.perf_counter_ns
+        consumed_kind = EVENT_CONSUMED
+        stop = STOP_SIGNAL
+        batch_size = BATCH_SIZE
+        name = self.name
+        destination = self.destination
+        trace = self._trace
+        if trace:
+            record((perf_counter_ns(), name, EVENT_STARTED, None, None, None))
+        
+        consumed = 0
+        running = True
+        while running:
+            # STEP 1: Retrieve a Batch (Blocking)
             # BLOCKS if empty (Internally calls not_empty.wait() to release lock)
             # The thread sleeps here if the Producer is slower than the Consumer.
-            item = self.shared_queue.get()
-            
-            buffer_after = self.shared_queue.qsize()
-            buffer_before = buffer_after + 1  # Capture the before-state while we own the slot
-            
-            # STEP 2: Check for Sentinel (Termination Condition)
-            if item is STOP_SIGNAL:
-                self.logger.info(f"Received STOP_SIGNAL. Quitting.  |  Buffer: {buffer_before} -> {buffer_after}")
-                self.shared_queue.task_done()
-                break
-            
-            # STEP 3: Process Item
-            # In a real app, this is where expensive calculation would happen.
-            # Here, we just store it to verify correctness later.
-            self.local_destination.append(item)
+            # A STOP_SIGNAL always ends the batch, so we never take another consumer's.
+            items, buffer_size = get_many(batch_size, sentinel=stop)
             
-            # Logging
-            spacing = "   " if item.item_id < 10 else "  "
-            self.logger.info(
-                f"Consumed WorkItem(id={item.item_id}){spacing}|  Buffer: {buffer_before} -> {buffer_after}"
-            )
-            
-            # STEP 4: Acknowledge Processing
-            # Important for .join() on the queue to work correctly (though we don't use queue.join() here explicitly)
-            self.shared_queue.task_done()
+            now = perf_counter_ns() if trace else 0
+            for item in items:
+                # STEP 2: Check for Sentinel (Termination Condition)
+                if item is stop:
+                    if trace:
+                        record((now, name, EVENT_STOPPED, None, buffer_size, buffer_size - 1))
+                    running = False
+                    break
+                
+                # STEP 3: Process Item
+                # In a real app, this is where expensive calculation would happen.
+                # Here, we just store it to verify correctness later.
+                destination[item - 1] = item
+                consumed += 1
+                
+                if trace:
+                    record((now, name, consumed_kind, item, buffer_size, buffer_size - 1))
+                buffer_size -= 1
+        
+        self.consumed_count = consumed
+
+class _PooledWorker:
+    """
+    A long-lived thread that runs one Producer/Consumer body per run().
+    
+    Offers the start()/join()/name/ident surface the manager uses on plain
+    worker threads, so run() drives either kind the same way.
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.task: Optional[threading.Thread] = None
+        self._go = threading.Event()
+        self._done = threading.Event()
+        # Daemon, so a manager that is never closed cannot keep the process alive
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+    
+    @property
+    def ident(self) -> Optional[int]:
+        return self._thread.ident
+    
+    @property
+    def _events(self) -> List[Event]:
+        return self.task._events
+    
+    def _loop(self) -> None:
+        while True:
+            self._go.wait()
+            self._go.clear()
+            task = self.task
+            if task is None:
+                return
+            try:
+                # Run the worker body on this thread instead of starting a new one
+                task.run()
+            finally:
+                self._done.set()
+    
+    def start(self) -> None:
+        """Run the bound task on the pooled thread."""
+        if not self._thread.is_alive():
+            raise RuntimeError(f"pooled worker {self.name} is no longer running")
+        self._done.clear()
+        self._go.set()
+    
+    def join(self) -> None:
+        """Wait until the bound task has finished."""
+        self._done.wait()
+    
+    def close(self) -> None:
+        """Stop the pooled thread."""
+        self.task = None
+        self._go.set()
+        self._thread.join()
+
 
 class SimulationManager:
     """Coordinates thread creation, sequencing, and orderly shutdown."""
     
     def __init__(self, number_of_items: int, queue_capacity: int, 
-                 num_producers: int = 1, num_consumers: int = 1):
+                 num_producers: int = 1, num_consumers: int = 1,
+                 log_level: int = logging.INFO, keep_workers: bool = False,
+                 backend: str = BACKEND_THREADING, bounded: bool = True):
         if not isinstance(number_of_items, int):
             raise TypeError(f"number_of_items must be an integer, got {type(number_of_items).__name__}")
         if not isinstance(queue_capacity, int):
@@ -172,6 +322,14 @@ class SimulationManager:
             raise ValueError(f"num_producers must be greater than 0, got {num_producers}")
         if num_consumers <= 0:
             raise ValueError(f"num_consumers must be greater than 0, got {num_consumers}")
+        if backend not in _BACKENDS:
+            raise ValueError(f"backend must be one of {', '.join(_BACKENDS)}, got {backend!r}")
+        # Worker processes are started per run and always talk through a
+        # bounded multiprocessing.Queue, so these thread options cannot apply
+        if backend == BACKEND_MULTIPROCESSING and keep_workers:
+            raise ValueError("keep_workers is not supported by the multiprocessing backend")
+        if backend == BACKEND_MULTIPROCESSING and not bounded:
+            raise ValueError("bounded=False is not supported by the multiprocessing backend")
         
         self.number_of_items = number_of_items
         self.queue_capacity = queue_capacity
@@ -181,35 +339,68 @@ class SimulationManager:
         # Pre-slice the item range so each producer owns a deterministic chunk
         self.source_data_chunks = self._distribute_items()
         
-        # Shared counter for globally ordered results
-        self.sequence_counter = threading.Lock()
-        self.sequence_value = [0]  # Single-element list so we can mutate by reference
-        
-        self.queue_capacity = queue_capacity
-        self.queue: queue.Queue = queue.Queue(maxsize=queue_capacity)
+        # "threading" shares one interpreter (and its GIL); "multiprocessing"
+        # runs every producer/consumer in its own process (see core_mp.py)
+        self.backend = backend
+        # bounded=False trades backpressure for a C-level SimpleQueue; the
+        # capacity is then ignored by the thread backend
+        self.bounded = bounded
+        # The process backend builds its own queues per run (see core_mp.py)
+        self.queue: Optional[SharedBuffer] = (
+            None if backend == BACKEND_MULTIPROCESSING else self._make_buffer()
+        )
         self.destination_data: List[WorkItem] = []
+        # Slot N holds the id of the item with sequence number N (None until consumed)
+        self._results: List[Optional[int]] = [None] * number_of_items
+        self.items_consumed = 0
+        self.logger = logging.getLogger(__name__)
+        # Per-item trace lines are INFO records: raising this to WARNING (or
+        # above) means the threads never record them in the first place.
+        self.log_level = log_level
+        # Opt-in: keep the worker threads alive between run() calls (see close())
+        self.keep_workers = keep_workers
+        self._pool: Optional[List[_PooledWorker]] = None
     
-    def _distribute_items(self) -> List[List[int]]:
+    def _make_buffer(self) -> SharedBuffer:
+        """
+        Pick the shared buffer for this thread layout.
+        
+        Without a bound, the SimpleQueue-backed UnboundedBuffer is used.
+        Otherwise, with one producer and one consumer each end of the buffer
+        has a single writer, so the lock-free RingBuffer is safe. Any other
+        layout needs the lock-based BoundedBuffer. (The STOP signal is posted by
+        the single producer itself once it is done, so there is still just one
+        writer.) RingBuffer also relies on the GIL to make a slot store visible
+        before the counter that publishes it, so a free-threaded interpreter
+        running without the GIL gets BoundedBuffer for every layout.
+        """
+        if not self.bounded:
+            return UnboundedBuffer()
+        if self.num_producers == 1 and self.num_consumers == 1 and _gil_enabled():
+            return RingBuffer(maxsize=self.queue_capacity)
+        return BoundedBuffer(maxsize=self.queue_capacity)
+    
+    def _distribute_items(self) -> List[range]:
         """
         Slice the source data into balanced chunks for the producers.
         
         Example: 
             Items=10, Producers=3
-            Returns: [[1, 2, 3, 4], [5, 6, 7], [8, 9, 10]]
+            Returns: [range(1, 5), range(5, 8), range(8, 11)]
         
         This ensures work is distributed as evenly as possible (load balancing).
+        Each chunk is built straight from its (start, stop) bounds, so no id
+        list is ever materialized: memory is O(producers), not O(items).
         """
-        source_data = list(range(1, self.number_of_items + 1))
-        chunk_size = self.number_of_items // self.num_producers
-        remainder = self.number_of_items % self.num_producers
+        chunk_size, remainder = divmod(self.number_of_items, self.num_producers)
         
         chunks = []
-        start = 0
+        start = 1
         for i in range(self.num_producers):
             # Hand remainder items to the earliest producers to keep gaps minimal
-            size = chunk_size + (1 if i < remainder else 0)
-            chunks.append(source_data[start:start + size])
-            start += size
+            stop = start + chunk_size + (1 if i < remainder else 0)
+            chunks.append(range(start, stop))
+            start = stop
         
         return chunks
 
@@ -220,28 +411,61 @@ class SimulationManager:
         Phases:
         1. Setup: Reset state, initialize queues and buffers.
         2. Launch: Create and start N Producers and M Consumers.
-        3. Monitor Producers: Wait for all producers to finish generating items.
-        4. Signal Shutdown: Inject 'Sentinels' (STOP_SIGNAL) for consumers.
+        3. Produce: Producers fill the buffer with their chunks.
+        4. Signal Shutdown: The last producer to finish injects 'Sentinels' (STOP_SIGNAL).
         5. Monitor Consumers: Wait for consumers to process remaining items and stop.
-        6. Aggregation: Merge results from all consumers and sort by sequence.
+        6. Aggregation: Read the sequence-indexed destination (already in order).
+        7. Logging: Replay every thread's trace events through the logger.
         """
         # Reset mutable state so the manager can be reused safely
-        self.sequence_value[0] = 0
+        # Pair the wall clock with the monotonic clock so trace events (stamped
+        # with perf_counter_ns) can be given a matching 'created' time later.
+        self._clock_anchor = (time.time(), time.perf_counter_ns())
         self.destination_data.clear()
-        self.queue = queue.Queue(maxsize=self.queue_capacity)
+        self._results = [None] * self.number_of_items
+        
+        if self.backend == BACKEND_MULTIPROCESSING:
+            # No per-item trace across processes, so log_level has nothing to gate here
+            self.items_consumed = run_processes(
+                self.source_data_chunks, self.queue_capacity, self.num_consumers,
+                self._results, BATCH_SIZE
+            )
+            self.destination_data.extend(self.results_as_workitems())
+            return self.destination_data
+        
+        # Reuse the buffer (and its lock/conditions) instead of rebuilding it
+        self.queue.clear()
+        
+        # Decide once per run whether anyone will see the trace
+        trace = self.log_level <= logging.INFO and self.logger.isEnabledFor(logging.INFO)
 
         # PHASE 1: Create Threads
         # -----------------------
         
+        # Post one STOP signal per consumer once every producer is done. This is
+        # safer than checking "queue empty" because the queue might be momentarily
+        # empty while producers are still working. A lock-guarded countdown picks
+        # the last producer: after it, no real items are coming.
+        producers_left = [self.num_producers]
+        countdown_lock = threading.Lock()
+        
+        def post_stops() -> None:
+            with countdown_lock:
+                producers_left[0] -= 1
+                last = producers_left[0] == 0
+            if last:
+                for _ in range(self.num_consumers):
+                    self.queue.put(STOP_SIGNAL)
+        
         # Create producers
         producers = []
         for i, source_chunk in enumerate(self.source_data_chunks):
             producer = Producer(
                 source_ids=source_chunk,
                 shared_queue=self.queue,
-                sequence_counter=self.sequence_counter,
-                sequence_value=self.sequence_value,
-                name=f"Producer-{i+1}"
+                name=f"Producer-{i+1}",
+                trace=trace,
+                on_finished=post_stops
             )
             producers.append(producer)
         
@@ -250,49 +474,104 @@ class SimulationManager:
         for i in range(self.num_consumers):
             consumer = Consumer(
                 shared_queue=self.queue,
-                name=f"Consumer-{i+1}"
+                destination=self._results,
+                name=f"Consumer-{i+1}",
+                trace=trace
             )
             consumers.append(consumer)
         
         # PHASE 2: Start Threads
         # ----------------------
-        # Once started, they run independently in parallel.
-        for producer in producers:
-            producer.start()
-        for consumer in consumers:
-            consumer.start()
-        
-        # PHASE 3: Wait for Production
-        # ----------------------------
-        # We block here until every producer has finished its assigned chunk.
-        for producer in producers:
-            producer.join()
-        
-        # PHASE 4: Initiate Shutdown (Sentinel)
-        # ----------------------------------------
-        # Post one STOP signal per consumer. This is safer than checking "queue empty"
-        # because the queue might be momentarily empty while producers are still working.
-        # Since producers are joined (finished), we know no real items are coming after this.
-        for _ in range(self.num_consumers):
-            self.queue.put(STOP_SIGNAL)
+        # Once started, they run independently in parallel. With keep_workers the
+        # bodies run on the pooled threads instead of freshly started ones.
+        workers = self._bind_pool(producers + consumers) if self.keep_workers else producers + consumers
+        producer_workers = workers[:len(producers)]
+        consumer_workers = workers[len(producers):]
+        for worker in workers:
+            worker.start()
+        
+        # PHASE 3 + 4: Production and Shutdown (Sentinel)
+        # -----------------------------------------------
+        # Nothing to do here: the last producer to finish posts the STOP signals
+        # itself (see post_stops), so shutdown overlaps with the consumers' drain
+        # instead of waiting for the manager to notice every producer has exited.
         
         # PHASE 5: Wait for Consumption
         # -----------------------------
         # Consumers will process the remaining buffer, hit the STOP_SIGNAL, and exit.
-        for consumer in consumers:
-            consumer.join()
+        # Producers finished before the last STOP was posted; joining them is instant.
+        for worker in consumer_workers:
+            worker.join()
+        for worker in producer_workers:
+            worker.join()
         
         # PHASE 6: Aggregate Results
         # --------------------------
-        # Merge each consumer's private buffer
-        all_results = []
-        for consumer in consumers:
-            all_results.extend(consumer.get_destination())
+        # Consumers wrote each item into its sequence slot, so the destination is
+        # already in the original order: no merge and no sort needed.
+        self.items_consumed = sum(consumer.consumed_count for consumer in consumers)
+        self.destination_data.extend(self.results_as_workitems())
         
-        # Sequence numbers restore the original ordering regardless of interleaving
-        all_results.sort(key=lambda item: item.sequence_number)
-
-        self.destination_data.extend(all_results)
+        # PHASE 7: Emit Trace
+        # -------------------
+        # Threads only buffered tuples while running; format and log them now,
+        # off the hot path, in one timestamp-ordered pass.
+        if trace:
+            self._flush_events(workers)
         
         return self.destination_data
 
+    def _bind_pool(self, tasks: List[threading.Thread]) -> List[_PooledWorker]:
+        """Hand this run's Producer/Consumer bodies to the pooled threads, creating them once."""
+        if self._pool is None:
+            self._pool = [_PooledWorker(task.name) for task in tasks]
+        for worker, task in zip(self._pool, tasks):
+            worker.task = task
+        return self._pool
+
+    def close(self) -> None:
+        """Stop the pooled worker threads (no-op unless keep_workers is set)."""
+        if self._pool is not None:
+            for worker in self._pool:
+                worker.close()
+            self._pool = None
+
+    def __enter__(self) -> "SimulationManager":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def results_as_workitems(self) -> List[WorkItem]:
+        """Build WorkItem objects for the last run's results, in sequence order."""
+        return [WorkItem(item_id, sequence_number=seq_num)
+                for seq_num, item_id in enumerate(self._results) if item_id is not None]
+
+    def _flush_events(self, threads: Iterable[threading.Thread]) -> None:
+        """Merge the threads' trace buffers and replay them as log records."""
+        events: List[Event] = []
+        idents = {}
+        for thread in threads:
+            events.extend(thread._events)
+            idents[thread.name] = thread.ident
+        events.sort(key=itemgetter(0))
+        
+        logger = self.logger
+        wall_anchor, ns_anchor = self._clock_anchor
+        for timestamp_ns, name, kind, item_id, buffer_before, buffer_after in events:
+            msg, args = _event_message(kind, item_id, buffer_before, buffer_after)
+            record = logger.makeRecord(
+                logger.name, logging.INFO, "(unknown file)", 0, msg, args, None
+            )
+            # Stamp the record as if the worker thread had logged it live
+            created = wall_anchor + (timestamp_ns - ns_anchor) / 1e9
+            # Shift relativeCreated by the same amount as created (before
+            # overwriting it) instead of recomputing it from logging internals
+            record.relativeCreated += (created - record.created) * 1000
+            record.created = created
+            record.msecs = (created - int(created)) * 1000
+            record._pc_ns = timestamp_ns
+            record.threadName = name
+            record.thread = idents[name]
+            logger.handle(record)
+
@@ -0,0 +1,133 @@
+"""asyncio flavour of the producer-consumer simulation.
+
+Producers and consumers are coroutines on a single event loop sharing an
+asyncio.Queue. Only one coroutine runs at a time and control changes hands
+only at an await, so the queue, the destination and the trace need no locks.
+A put/get that does not have to wait never suspends at all. This suits
+I/O-bound per-item work: thousands of coroutines cost far less than as
+many OS threads.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from types import SimpleNamespace
+from typing import List, Optional, Sequence
+
+from .core import (
+    BACKEND_THREADING, EVENT_CONSUMED, EVENT_FINISHED, EVENT_PRODUCED, EVENT_STARTED,
+    EVENT_STOPPED, STOP_SIGNAL, Event, SimulationManager,
+)
+from .models import WorkItem
+
+
+async def producer(source_ids: Sequence[int], shared_queue: asyncio.Queue,
+                   events: List[Event], name: str, trace: bool = True) -> None:
+    """Coroutine counterpart of Producer.run: enqueue every id in the chunk."""
+    record = events.append
+    put = shared_queue.put
+    qsize = shared_queue.qsize
+    if trace:
+        record((time.perf_counter_ns(), name, EVENT_STARTED, None, None, None))
+    for item_id in source_ids:
+        # Suspends only while the queue is full
+        await put(item_id)
+        if trace:
+            # No other coroutine ran since the put, so the size is exact
+            buffer_size = qsize()
+            record((time.perf_counter_ns(), name, EVENT_PRODUCED, item_id, buffer_size - 1, buffer_size))
+    if trace:
+        record((time.perf_counter_ns(), name, EVENT_FINISHED, None, None, None))
+
+
+async def consumer(shared_queue: asyncio.Queue, destination: List[Optional[int]],
+                   events: List[Event], name: str, trace: bool = True) -> int:
+    """Coroutine counterpart of Consumer.run: drain ids until STOP_SIGNAL."""
+    record = events.append
+    get = shared_queue.get
+    qsize = shared_queue.qsize
+    if trace:
+        record((time.perf_counter_ns(), name, EVENT_STARTED, None, None, None))
+    consumed = 0
+    while True:
+        # Suspends only while the queue is empty
+        item = await get()
+        if item is STOP_SIGNAL:
+            if trace:
+                buffer_size = qsize()
+                record((time.perf_counter_ns(), name, EVENT_STOPPED, None, buffer_size + 1, buffer_size))
+            return consumed
+        destination[item - 1] = item
+        consumed += 1
+        if trace:
+            buffer_size = qsize()
+            record((time.perf_counter_ns(), name, EVENT_CONSUMED, item, buffer_size + 1, buffer_size))
+
+
+class AsyncSimulationManager(SimulationManager):
+    """
+    SimulationManager that runs producers and consumers as coroutines.
+
+    Validation, chunking, result aggregation and the trace replay are
+    inherited; only the execution phase differs. There are no threads to
+    keep and no process backend, so keep_workers=True and any backend other
+    than the default are rejected. bounded=False gives an unbounded
+    asyncio.Queue.
+    """
+
+    def __init__(self, number_of_items: int, queue_capacity: int,
+                 num_producers: int = 1, num_consumers: int = 1,
+                 log_level: int = logging.INFO, keep_workers: bool = False,
+                 backend: str = BACKEND_THREADING, bounded: bool = True):
+        super().__init__(number_of_items, queue_capacity, num_producers, num_consumers,
+                         log_level, keep_workers, backend, bounded)
+        if keep_workers:
+            raise ValueError("keep_workers is not supported by AsyncSimulationManager")
+        if backend != BACKEND_THREADING:
+            raise ValueError(f"backend is not supported by AsyncSimulationManager, got {backend!r}")
+
+    def _make_buffer(self) -> None:
+        """No shared thread buffer: run_async() builds an asyncio.Queue per run."""
+        return None
+
+    async def run_async(self) -> List[WorkItem]:
+        """Execute one simulation on the running event loop."""
+        self._clock_anchor = (time.time(), time.perf_counter_ns())
+        self.destination_data.clear()
+        self._results = [None] * self.number_of_items
+        trace = self.log_level <= logging.INFO and self.logger.isEnabledFor(logging.INFO)
+
+        # maxsize=0 is asyncio's "no limit"
+        shared_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_capacity if self.bounded else 0)
+        # Stand-ins for the worker threads: _flush_events only needs name, ident and _events
+        ident = threading.get_ident()
+        workers = [SimpleNamespace(name=f"Producer-{i+1}", ident=ident, _events=[])
+                   for i in range(self.num_producers)]
+        workers += [SimpleNamespace(name=f"Consumer-{i+1}", ident=ident, _events=[])
+                    for i in range(self.num_consumers)]
+        producer_workers = workers[:self.num_producers]
+        consumer_workers = workers[self.num_producers:]
+
+        consumer_tasks = [
+            asyncio.create_task(consumer(shared_queue, self._results, worker._events, worker.name, trace))
+            for worker in consumer_workers
+        ]
+        await asyncio.gather(*(
+            producer(chunk, shared_queue, worker._events, worker.name, trace)
+            for chunk, worker in zip(self.source_data_chunks, producer_workers)
+        ))
+
+        # Production is over: one STOP per consumer, exactly as in run()
+        for _ in range(self.num_consumers):
+            await shared_queue.put(STOP_SIGNAL)
+        self.items_consumed = sum(await asyncio.gather(*consumer_tasks))
+
+        self.destination_data.extend(self.results_as_workitems())
+        if trace:
+            self._flush_events(workers)
+        return self.destination_data
+
+    def run(self) -> List[WorkItem]:
+        """Execute one simulation on a fresh event loop (see run_async)."""
+        return asyncio.run(self.run_async())
@@ -0,0 +1,132 @@
+"""Process-based backend for the producer-consumer simulation.
+
+The thread backend in core.py shares one interpreter, so under the GIL only
+one producer or consumer runs Python code at a time. This backend runs each
+producer and consumer in its own process around a multiprocessing.Queue, so
+CPU-heavy per-item work can use every core.
+
+Each queue message is a whole batch (a range slice, which pickles as three
+integers), because every put/get crosses a pipe. The queue's maxsize counts
+batches, so it is sized to keep at most queue_capacity items in flight.
+Consumers send the ids they handled back through a result queue; the
+per-item "Buffer: X -> Y" trace is not recorded here, because occupancy is
+not observable across processes without an extra shared lock.
+"""
+
+import multiprocessing
+import queue
+from typing import List, Optional, Sequence
+
+# End-of-stream marker. A plain None survives pickling with its identity;
+# the thread backend's object() sentinel would not.
+STOP = None
+
+# How long the parent blocks on a join/put/get before checking that no child
+# process has died (a dead consumer would otherwise leave it waiting forever)
+_POLL_SECONDS = 0.5
+
+
+def _produce(source_ids: Sequence[int], data_queue, batch_size: int) -> None:
+    """Process body: push this producer's ids as batches of up to batch_size."""
+    put = data_queue.put
+    for start in range(0, len(source_ids), batch_size):
+        put(source_ids[start:start + batch_size])
+
+
+def _consume(data_queue, result_queue) -> None:
+    """Process body: drain batches until STOP, then report every id handled."""
+    get = data_queue.get
+    handled: List[int] = []
+    while True:
+        batch = get()
+        if batch is STOP:
+            break
+        # In a real app, the expensive per-item work would happen here
+        handled.extend(batch)
+    result_queue.put(handled)
+
+
+def _raise_if_failed(processes: Sequence[multiprocessing.Process]) -> None:
+    """Raise RuntimeError naming the first child that exited abnormally."""
+    for process in processes:
+        if process.exitcode not in (None, 0):
+            raise RuntimeError(f"{process.name} process exited with code {process.exitcode}")
+
+
+def run_processes(source_chunks: Sequence[range], queue_capacity: int,
+                  num_consumers: int, destination: List[Optional[int]],
+                  batch_size: int) -> int:
+    """
+    Run one process per producer chunk and per consumer.
+
+    Args:
+        source_chunks: One id range per producer (see SimulationManager._distribute_items).
+        queue_capacity: Maximum number of items in flight between the two sides.
+        num_consumers: Number of consumer processes.
+        destination: Pre-sized list; slot N receives the item with id N + 1.
+        batch_size: Upper bound on ids per queue message.
+
+    Returns:
+        The number of items the consumers handled.
+
+    Raises:
+        RuntimeError: If a producer or consumer process dies (an exception
+            or a kill); the remaining processes are terminated.
+    """
+    batch_size = min(batch_size, queue_capacity)
+    data_queue = multiprocessing.Queue(maxsize=max(1, queue_capacity // batch_size))
+    result_queue = multiprocessing.Queue()
+
+    producers = [
+        multiprocessing.Process(target=_produce, args=(chunk, data_queue, batch_size),
+                                name=f"Producer-{i+1}")
+        for i, chunk in enumerate(source_chunks)
+    ]
+    consumers = [
+        multiprocessing.Process(target=_consume, args=(data_queue, result_queue),
+                                name=f"Consumer-{i+1}")
+        for i in range(num_consumers)
+    ]
+    processes = producers + consumers
+    for process in processes:
+        process.start()
+
+    try:
+        # Every blocking call is bounded, so a dead child is noticed instead
+        # of leaving the parent waiting on a queue nobody will serve
+        for producer in producers:
+            while producer.exitcode is None:
+                producer.join(_POLL_SECONDS)
+                _raise_if_failed(processes)
+        for _ in range(num_consumers):
+            while True:
+                try:
+                    data_queue.put(STOP, timeout=_POLL_SECONDS)
+                    break
+                except queue.Full:
+                    _raise_if_failed(processes)
+
+        # Collect before joining: a process that still has data in its queue
+        # feeder thread cannot exit, so joining first could deadlock.
+        consumed = 0
+        pending = num_consumers
+        while pending:
+            try:
+                handled = result_queue.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                _raise_if_failed(processes)
+                continue
+            for item_id in handled:
+                destination[item_id - 1] = item_id
+                consumed += 1
+            pending -= 1
+        for consumer in consumers:
+            consumer.join()
+    except BaseException:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        raise
+
+    return consumed
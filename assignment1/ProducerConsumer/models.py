@@ -1,9 +1,8 @@
 """Lightweight data structures shared between producers and consumers."""
 
-from dataclasses import dataclass
+from typing import NamedTuple
 
-@dataclass(frozen=True)
-class WorkItem:
+class WorkItem(NamedTuple):
     """Immutable payload tagged with a global sequence number."""
     item_id: int
     sequence_number: int = 0
@@ -11,4 +10,3 @@ class WorkItem:
     def __repr__(self) -> str:
         """String representation showing the item ID and sequence number."""
         return f"WorkItem(id={self.item_id}, seq={self.sequence_number})"
-
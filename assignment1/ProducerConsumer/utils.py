@@ -1,26 +1,85 @@
 """Logging helpers shared by the CLI and tests."""
 
+import heapq
 import logging
-from typing import List
+import threading
+import time
+from bisect import insort
+from itertools import pairwise
+from operator import attrgetter
+from typing import Dict, Iterator, List
+
+# Sort key for captured records: a monotonic integer, so ordering is exact
+# even when several threads log within the same wall-clock tick.
+_by_pc_ns = attrgetter("_pc_ns")
 
 class LogCaptureHandler(logging.Handler):
     """In-memory handler we can query later for timestamp-ordered logs."""
     
     def __init__(self):
         super().__init__()
-        self.captured_logs: List[logging.LogRecord] = []
+        # One list per logging thread: each thread only ever appends to its
+        # own list, so capturing never contends on a shared lock. Each list is
+        # kept in _pc_ns order, so reading them back is a merge, not a sort.
+        self._per_thread: Dict[int, List[logging.LogRecord]] = {}
+    
+    @property
+    def captured_logs(self) -> List[logging.LogRecord]:
+        """All captured records, grouped by thread in capture order."""
+        return list(self.get_records())
+    
+    def handle(self, record: logging.LogRecord) -> bool:
+        """Filter and emit without taking the handler lock (see emit)."""
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
     
     def emit(self, record: logging.LogRecord) -> None:
         """Capture log records without emitting them anywhere else."""
-        self.captured_logs.append(record)
+        # Replayed trace records already carry the time the event happened
+        if not hasattr(record, "_pc_ns"):
+            record._pc_ns = time.perf_counter_ns()
+        ident = threading.get_ident()
+        records = self._per_thread.get(ident)
+        if records is None:
+            # Only this thread ever inserts this key; dict writes are atomic under the GIL
+            records = self._per_thread[ident] = []
+        if records and record._pc_ns < records[-1]._pc_ns:
+            # Rare: a record stamped earlier than the last one (e.g. a replayed
+            # trace event after a live line). Keep the list ordered.
+            insort(records, record, key=_by_pc_ns)
+        else:
+            records.append(record)
+    
+    def get_records(self) -> Iterator[logging.LogRecord]:
+        """Yield captured records in capture order (thread by thread), without sorting."""
+        for records in list(self._per_thread.values()):
+            yield from records
+    
+    def is_monotone(self) -> bool:
+        """Return True if the merged output (get_sorted_logs) never steps back on either clock.
+        
+        The merge orders records by _pc_ns, so this mainly checks that the
+        wall-clock 'created' stamps every reader sees agree with that order
+        across all threads, replayed trace records included.
+        """
+        return all(
+            earlier._pc_ns <= later._pc_ns and earlier.created <= later.created
+            for earlier, later in pairwise(self.get_sorted_logs())
+        )
     
     def get_sorted_logs(self) -> List[logging.LogRecord]:
-        """Return captured logs sorted by timestamp."""
-        return sorted(self.captured_logs, key=lambda r: r.created)
+        """Return captured logs from every thread, sorted by their monotonic timestamp."""
+        # Every per-thread list is already ordered: a k-way merge is O(N log k)
+        lists = list(self._per_thread.values())
+        if len(lists) == 1:
+            return list(lists[0])
+        return list(heapq.merge(*lists, key=_by_pc_ns))
     
     def clear_logs(self) -> None:
         """Clear all captured logs."""
-        self.captured_logs.clear()
+        self._per_thread.clear()
 
 def setup_logging() -> logging.Handler:
     """
@@ -0,0 +1,33 @@
+"""Shared pytest fixtures for the Assignment 1 test suite."""
+
+import gc
+
+import pytest
+
+
+@pytest.fixture
+def interactive_stdin(monkeypatch):
+    """Make the CLI believe a human is at the keyboard for the current test.
+
+    The CLI checks ``sys.stdin.isatty()`` once at import and caches the result
+    in ``cli._INTERACTIVE``, so that flag (not ``isatty``) is what gets swapped.
+    """
+    monkeypatch.setattr("ProducerConsumer.cli._INTERACTIVE", True)
+
+
+@pytest.fixture(scope="module")
+def no_gc():
+    """Keep the cyclic garbage collector off for a whole test module.
+
+    pytest itself does not collect between tests; the cost is the automatic
+    generational passes that allocation-heavy tests (thousands of WorkItems)
+    keep triggering. Modules whose tests build no reference cycles that need
+    collecting opt in with ``pytestmark = pytest.mark.usefixtures("no_gc")``;
+    one explicit collection at module teardown releases anything left over.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    yield
+    if was_enabled:
+        gc.enable()
+    gc.collect()
@@ -4,8 +4,13 @@ This module validates the fundamental contract of the Producer-Consumer system:
 "What goes in must come out."
 """
 
+import logging
+import os
+
 import pytest
+from ProducerConsumer import core_mp
 from ProducerConsumer.core import SimulationManager
+from ProducerConsumer.core_async import AsyncSimulationManager
 
 def test_basic_production_consumption():
     """
@@ -37,3 +42,60 @@ def test_basic_production_consumption():
     # so we expect a perfect 1..50 sequence here.
     assert results[0].item_id == 1
     assert results[-1].item_id == 50
+
+@pytest.mark.timeout(60)
+def test_multiprocessing_backend_production_consumption():
+    """
+    Verify the process backend honours the same contract.
+    
+    Scenario:
+        - 2 producer and 3 consumer processes, a buffer smaller than one batch.
+    
+    Assertions:
+        1. Every id comes back exactly once, in sequence order.
+        2. items_consumed counts all of them.
+    """
+    manager = SimulationManager(200, 7, num_producers=2, num_consumers=3, backend="multiprocessing")
+    results = manager.run()
+    
+    assert [item.item_id for item in results] == list(range(1, 201))
+    assert manager.items_consumed == 200
+    assert manager.queue is None  # no thread buffer is built for this backend
+
+def _crashing_consumer(data_queue, result_queue):
+    """Consumer process body that dies before reporting, like an OOM kill."""
+    os._exit(3)
+
+@pytest.mark.timeout(60)
+def test_multiprocessing_backend_reports_dead_consumer(monkeypatch):
+    """
+    A consumer process that dies must fail the run, not hang it.
+    
+    Why: The parent waits on queues only the consumers serve. Without a
+    liveness check it would block forever on a process that no longer exists.
+    """
+    monkeypatch.setattr(core_mp, "_consume", _crashing_consumer)
+    manager = SimulationManager(200, 7, num_producers=2, num_consumers=1, backend="multiprocessing")
+    with pytest.raises(RuntimeError, match="Consumer-1 process exited with code 3"):
+        manager.run()
+
+def test_async_manager_production_consumption(caplog):
+    """
+    Verify the asyncio manager honours the same contract and trace.
+    
+    Assertions:
+        1. Every id comes back exactly once, in sequence order.
+        2. The replayed trace names every coroutine worker and stays within capacity.
+    """
+    caplog.set_level(logging.INFO)
+    manager = AsyncSimulationManager(60, 4, num_producers=2, num_consumers=3)
+    results = manager.run()
+    
+    assert [item.item_id for item in results] == list(range(1, 61))
+    assert manager.items_consumed == 60
+    
+    names = {record.threadName for record in caplog.records}
+    assert names == {"Producer-1", "Producer-2", "Consumer-1", "Consumer-2", "Consumer-3"}
+    item_records = [r for r in caplog.records if r.msg.startswith("%s WorkItem")]
+    assert len(item_records) == 120
+    assert all(0 <= r.args[-1] <= 4 for r in item_records)
@@ -9,6 +9,17 @@ import re
 import logging
 from ProducerConsumer.core import SimulationManager
 
+# Matches a whole transition line such as "Produced WorkItem(id=3)   |  Buffer: 3 -> 4",
+# capturing the operation and both states by name. MULTILINE anchors each match
+# to one line of a newline-joined log stream, and no part of the pattern can
+# cross a newline. (Compiled once per module.)
+_LINE_RE = re.compile(
+    r'^(?P<op>Produced|Consumed|Received STOP_SIGNAL)[^|\n]*\| +'
+    r'Buffer: (?P<before>\d+) -> (?P<after>\d+)$',
+    re.MULTILINE,
+)
+_OP_CODES = {"Produced": 1, "Consumed": -1, "Received STOP_SIGNAL": -1}
+
 def test_buffer_state_continuity(caplog):
     """
     Verify that buffer state transitions are logically consistent.
@@ -25,69 +36,78 @@ def test_buffer_state_continuity(caplog):
            and 'Consume' operations should decrease it.
         3. **Finality**: The system must end with an empty buffer (State 0).
     """
-    # Capture INFO level logs to analyze output
-    caplog.set_level(logging.INFO)
-    
     n_items = 20
     capacity = 5
     manager = SimulationManager(n_items, capacity)
-    manager.run()
     
-    # Regex to extract state from logs: "Buffer: 3 -> 4"
-    buffer_pattern = re.compile(r'Buffer:\s*(\d+)\s*->\s*(\d+)')
-    buffer_transitions = []
-    operation_types = []
+    # at_level() only enables INFO on the simulation's logger; caplog's handler
+    # still sees every logger, so the filter keeps just the simulation's
+    # buffer-state lines out of caplog.records. It reads record.msg, which for
+    # the simulation's %-style records is the template, so nothing is
+    # formatted just to be filtered out (other loggers may log non-str msgs).
+    def _transitions_only(record):
+        return (record.name.startswith("ProducerConsumer")
+                and isinstance(record.msg, str) and "Buffer:" in record.msg)
     
-    # Parse the logs
-    for record in caplog.records:
-        message = record.getMessage()
-        match = buffer_pattern.search(message)
-        if match:
-            before_state = int(match.group(1))
-            after_state = int(match.group(2))
-            buffer_transitions.append((before_state, after_state))
-            
-            # Categorize operation
-            if "Produced" in message or "Finished production" in message:
-                operation_types.append("produce")
-            elif "Consumed" in message or "Received STOP_SIGNAL" in message:
-                operation_types.append("consume")
-            else:
-                operation_types.append("unknown")
+    caplog.handler.addFilter(_transitions_only)
+    try:
+        with caplog.at_level(logging.INFO, logger="ProducerConsumer"):
+            manager.run()
+    finally:
+        caplog.handler.removeFilter(_transitions_only)
     
-    # --- VERIFICATION PHASE ---
+    # Validated in a single pass: only the running counts and the last
+    # reported state are needed afterwards, so nothing else is stored.
+    produce_count = 0
+    consume_count = 0
+    last_after = None
     
-    # 1. Verify we actually got data
-    assert len(buffer_transitions) > 0, "No buffer state transitions found in logs"
+    # The captured lines are joined into one string so the regex engine makes
+    # a single finditer() sweep instead of one call per record.
+    log_stream = "\n".join(
+        record.getMessage() if record.args else record.msg
+        for record in caplog.records
+    )
     
-    # 2. Boundary Checks (Safety Property)
-    # The buffer should NEVER report a size < 0 or > capacity.
-    for before_state, after_state in buffer_transitions:
+    # --- PARSE + VERIFY (one pass) ---
+    for match in _LINE_RE.finditer(log_stream):
+        before_state = int(match.group('before'))
+        after_state = int(match.group('after'))
+        # Categorize operation straight from the captured keyword
+        op_code = _OP_CODES[match.group('op')]
+        
+        # Boundary Checks (Safety Property)
+        # The buffer should NEVER report a size < 0 or > capacity.
         assert 0 <= before_state <= capacity, (
             f"Invalid before state: {before_state} (must be 0-{capacity})"
         )
         assert 0 <= after_state <= capacity, (
             f"Invalid after state: {after_state} (must be 0-{capacity})"
         )
-    
-    # 3. Transition Logic Checks (Liveness Property)
-    for i, ((before_state, after_state), op_type) in enumerate(zip(buffer_transitions, operation_types)):
+        
+        # Transition Direction Checks (Safety Property)
+        # Producer adds an item -> delta should be +1; it should NEVER be negative.
+        # Consumer removes an item -> delta should be -1; it should NEVER be positive.
         delta = after_state - before_state
+        operation = produce_count + consume_count
+        if op_code > 0:
+            assert delta >= 0, f"Producer operation {operation} showed impossible buffer decrease"
+            produce_count += 1
+        else:
+            assert delta <= 0, f"Consumer operation {operation} showed impossible buffer increase"
+            consume_count += 1
         
-        if op_type == "produce":
-            # Producer adds an item -> Delta should be +1 (or 0 if highly contended/approximate)
-            # It should NEVER be negative (Producer removing an item? Impossible!)
-            assert delta >= 0, f"Producer operation {i} showed impossible buffer decrease"
-            
-        elif op_type == "consume":
-            # Consumer removes an item -> Delta should be -1
-            # It should NEVER be positive (Consumer adding an item? Impossible!)
-            assert delta <= 0, f"Consumer operation {i} showed impossible buffer increase"
+        last_after = after_state
+    
+    # 1. Verify we actually got data: every item produced once, and consumed
+    # once plus the single consumer's STOP_SIGNAL (counted during the parse)
+    assert last_after is not None, "No buffer state transitions found in logs"
+    assert produce_count == n_items, f"Expected {n_items} produce transitions, got {produce_count}"
+    assert consume_count == n_items + 1, f"Expected {n_items + 1} consume transitions, got {consume_count}"
     
-    # 4. Final State Check
+    # 2. Final State Check
     # After everything is done, the buffer must be empty.
     # If it's not 0, we have a "Memory Leak" (stranded items).
-    final_transition = buffer_transitions[-1]
-    assert final_transition[1] == 0, (
-        f"Final buffer state should be 0, but got {final_transition[1]}"
+    assert last_after == 0, (
+        f"Final buffer state should be 0, but got {last_after}"
     )
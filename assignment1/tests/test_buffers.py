@@ -0,0 +1,174 @@
+"""Tests for the batched bounded buffer used as the shared queue."""
+
+import queue
+import sys
+import threading
+
+import pytest
+from ProducerConsumer.buffers import BoundedBuffer, RingBuffer, UnboundedBuffer
+from ProducerConsumer.core import SimulationManager
+
+def test_put_many_reports_size_before_batch():
+    """put_many returns the occupancy seen just before the batch was inserted."""
+    buffer = BoundedBuffer(maxsize=5)
+    assert buffer.put_many([1, 2]) == 0
+    assert buffer.put_many([3, 4, 5]) == 2
+    assert buffer.qsize() == 5
+
+def test_put_many_rejects_batch_larger_than_capacity():
+    """A batch that can never fit must fail fast instead of blocking forever."""
+    buffer = BoundedBuffer(maxsize=2)
+    with pytest.raises(ValueError, match="exceeds buffer capacity"):
+        buffer.put_many([1, 2, 3])
+
+def test_get_many_stops_after_sentinel():
+    """
+    A batch ends at the first sentinel.
+
+    Why: With several consumers, one greedy batch must not swallow the
+    STOP signals addressed to the others.
+    """
+    stop = object()
+    buffer = BoundedBuffer(maxsize=10)
+    buffer.put_many([1, 2, stop, stop, 3])
+
+    items, before = buffer.get_many(10, sentinel=stop)
+    assert items == [1, 2, stop]
+    assert before == 5
+
+    items, before = buffer.get_many(10, sentinel=stop)
+    assert items == [stop]
+    assert before == 2
+
+@pytest.mark.parametrize("layout", [
+    dict(num_producers=2, num_consumers=2),
+    dict(num_producers=1, num_consumers=1),
+])
+def test_simulation_never_calls_qsize(monkeypatch, layout):
+    """
+    The buffer trace is derived from put_many/get_many, not from qsize().
+
+    Why: BoundedBuffer.qsize() takes the queue mutex, so calling it per item
+    would add a second lock round-trip on the hot path just to print
+    "Buffer: X -> Y". Both bounded layouts must keep it off the hot path.
+    (UnboundedBuffer reads SimpleQueue.qsize() by design; see the next test.)
+    """
+    def _forbidden(self):
+        raise AssertionError("qsize() called on the hot path")
+
+    for buffer_cls in (BoundedBuffer, RingBuffer):
+        monkeypatch.setattr(buffer_cls, "qsize", _forbidden)
+    manager = SimulationManager(number_of_items=30, queue_capacity=4, **layout)
+    assert len(manager.run()) == 30
+
+def test_unbounded_buffer_reads_size_once_per_batch(monkeypatch):
+    """
+    UnboundedBuffer's "before" sizes come from SimpleQueue.qsize() itself.
+
+    Why: That call takes no lock, but it still must be paid once per batch,
+    never once per item. The underlying SimpleQueue is swapped for a
+    subclass that records every qsize() call, so the test sees the real
+    calls rather than the wrapper method the buffer never uses internally.
+    """
+    qsize_calls = []
+    batch_calls = []
+
+    class _CountingQueue(queue.SimpleQueue):
+        def qsize(self):
+            qsize_calls.append(None)  # list.append is atomic under the GIL
+            return super().qsize()
+
+    for name in ("put_many", "get_many"):
+        original = getattr(UnboundedBuffer, name)
+        def _counted(self, *args, _original=original, **kwargs):
+            batch_calls.append(None)
+            return _original(self, *args, **kwargs)
+        monkeypatch.setattr(UnboundedBuffer, name, _counted)
+
+    manager = SimulationManager(200, 4, num_producers=2, num_consumers=2, bounded=False)
+    manager.queue._queue = _CountingQueue()
+    assert len(manager.run()) == 200
+    assert 0 < len(qsize_calls) <= len(batch_calls)
+
+def test_ring_buffer_wraps_and_keeps_logical_capacity():
+    """Storage rounds up to a power of two, but maxsize still bounds occupancy."""
+    ring = RingBuffer(maxsize=3)
+    assert len(ring._slots) == 4
+    for round_start in range(0, 30, 3):
+        assert ring.put_many([round_start, round_start + 1, round_start + 2]) == 0
+        items, before = ring.get_many(10)
+        assert items == [round_start, round_start + 1, round_start + 2]
+        assert before == 3
+    with pytest.raises(ValueError, match="exceeds buffer capacity"):
+        ring.put_many([1, 2, 3, 4])
+
+@pytest.mark.timeout(10)
+def test_ring_buffer_spsc_transfer_blocks_and_wakes():
+    """A tiny ring forces both sides through the full/empty wait paths."""
+    stop = object()
+    ring = RingBuffer(maxsize=2)
+    received = []
+
+    def consume():
+        while True:
+            items, _ = ring.get_many(2, sentinel=stop)
+            if items[-1] is stop:
+                received.extend(items[:-1])
+                return
+            received.extend(items)
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    for item_id in range(1000):
+        ring.put(item_id)
+    ring.put(stop)
+    consumer.join()
+    assert received == list(range(1000))
+
+def test_single_producer_single_consumer_uses_ring_buffer():
+    """The 1P/1C layout takes the lock-free path; anything else stays locked."""
+    assert isinstance(SimulationManager(10, 3).queue, RingBuffer)
+    assert isinstance(SimulationManager(10, 3, num_producers=2).queue, BoundedBuffer)
+    assert [item.item_id for item in SimulationManager(50, 3).run()] == list(range(1, 51))
+
+def test_ring_buffer_needs_the_gil(monkeypatch):
+    """Without the GIL nothing orders RingBuffer's stores, so 1P/1C falls back to the lock."""
+    monkeypatch.setattr(sys, "_is_gil_enabled", lambda: False, raising=False)
+    manager = SimulationManager(50, 3)
+    assert isinstance(manager.queue, BoundedBuffer)
+    assert [item.item_id for item in manager.run()] == list(range(1, 51))
+
+@pytest.mark.parametrize("make_buffer", [
+    lambda: BoundedBuffer(maxsize=4), lambda: RingBuffer(maxsize=4), UnboundedBuffer,
+])
+def test_clear_resets_buffer_for_reuse(make_buffer):
+    """clear() empties a partly filled buffer so a new run starts from zero."""
+    buffer = make_buffer()
+    buffer.put_many([1, 2, 3])
+    buffer.clear()
+    assert buffer.qsize() == 0
+    assert buffer.put_many([4, 5, 6, 7]) == 0
+    assert buffer.get_many(10) == ([4, 5, 6, 7], 4)
+
+def test_manager_reuses_buffer_across_runs():
+    """Repeated run() calls keep the same buffer instead of allocating a new one."""
+    manager = SimulationManager(number_of_items=20, queue_capacity=3, num_consumers=2)
+    buffer = manager.queue
+    for _ in range(3):
+        assert [item.item_id for item in manager.run()] == list(range(1, 21))
+        assert manager.queue is buffer
+        assert buffer.qsize() == 0
+
+def test_unbounded_buffer_never_blocks_producers():
+    """bounded=False swaps in the SimpleQueue-backed buffer; puts beyond capacity don't wait."""
+    stop = object()
+    buffer = UnboundedBuffer()
+    buffer.put_many(range(500))
+    buffer.put(stop)
+    items, before = buffer.get_many(1000, sentinel=stop)
+    assert items[:-1] == list(range(500)) and items[-1] is stop
+    assert before == 501
+
+    manager = SimulationManager(200, 2, num_producers=2, num_consumers=2, bounded=False)
+    assert isinstance(manager.queue, UnboundedBuffer)
+    assert [item.item_id for item in manager.run()] == list(range(1, 201))
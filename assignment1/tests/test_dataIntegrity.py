@@ -54,10 +54,14 @@ def test_all_items_present():
     
     assert len(results) == n_items
     
-    # Check the exact set of IDs
-    item_ids = {item.item_id for item in results}
-    expected_ids = set(range(1, n_items + 1))
-    assert item_ids == expected_ids, "Not all expected items are present"
+    # Check the exact set of IDs without building hash sets: N ids, each in
+    # 1..N and none repeated (seen-vector), can only be exactly 1..N.
+    seen = bytearray(n_items + 1)
+    for item in results:
+        item_id = item.item_id
+        assert 1 <= item_id <= n_items, f"Unexpected item id {item_id}"
+        assert not seen[item_id], f"Duplicate item id {item_id}"
+        seen[item_id] = 1
 
 def test_item_ids_match_sequence():
     """
@@ -72,6 +76,38 @@ def test_item_ids_match_sequence():
     manager = SimulationManager(n_items, capacity)
     results = manager.run()
     
-    expected_sequence = list(range(1, n_items + 1))
-    actual_sequence = [item.item_id for item in results]
-    assert actual_sequence == expected_sequence, "Item IDs don't match expected sequence"
+    for item in results:
+        assert item.sequence_number == item.item_id - 1, (
+            f"Item {item.item_id} has sequence {item.sequence_number}, expected {item.item_id - 1}"
+        )
+
+def test_sequence_numbers_are_dense_positions():
+    """
+    Verify every result sits at the index equal to its sequence number.
+    
+    Why: Results are placed straight into a pre-sized slot per sequence
+    number instead of being sorted afterwards. That is only correct if the
+    sequence numbers form the dense range 0..N-1, even with several
+    producers and consumers racing.
+    """
+    n_items = 60
+    manager = SimulationManager(n_items, 4, num_producers=3, num_consumers=3)
+    results = manager.run()
+    
+    assert [item.sequence_number for item in results] == list(range(n_items))
+    assert all(item.item_id == item.sequence_number + 1 for item in results)
+
+def test_distribute_items_balanced_contiguous_ranges():
+    """
+    Verify producer chunks are lazy, contiguous and balanced.
+    
+    Why: Each chunk is a range covering its slice of 1..N, so sequence
+    numbers can be derived from ids. Remainder items go to the earliest
+    producers, so chunk sizes differ by at most one.
+    """
+    manager = SimulationManager(10, 5, num_producers=3)
+    assert manager.source_data_chunks == [range(1, 5), range(5, 8), range(8, 11)]
+    
+    manager = SimulationManager(3, 5, num_producers=5)
+    assert [len(chunk) for chunk in manager.source_data_chunks] == [1, 1, 1, 0, 0]
+    assert all(isinstance(chunk, range) for chunk in manager.source_data_chunks)
@@ -43,14 +43,19 @@ def test_very_large_capacity():
     results = manager.run()
     assert len(results) == 10
 
-def test_extreme_contention():
+@pytest.mark.parametrize("n_items, capacity", [
+    (20, 1),
+    pytest.param(100, 1, marks=pytest.mark.slow),
+])
+def test_extreme_contention(n_items, capacity):
     """
     Test capacity=1 with many items (Extreme Contention).
     
     Why: This forces maximum synchronization overhead.
     Every single produce operation blocks until a consume happens, and vice versa.
-    It's a stress test for the Wait/Notify mechanism.
+    It's a stress test for the Wait/Notify mechanism. The small case proves the
+    property on every run; the 100-item soak only runs with '-m slow'.
     """
-    manager = SimulationManager(number_of_items=100, queue_capacity=1)
+    manager = SimulationManager(number_of_items=n_items, queue_capacity=capacity)
     results = manager.run()
-    assert len(results) == 100
+    assert len(results) == n_items
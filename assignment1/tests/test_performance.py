@@ -2,16 +2,18 @@
 
 These tests act as "canaries in the coal mine" for deadlocks.
 If the code hangs, the timeout decorator kills the test and fails it.
+
+Actual throughput is measured separately by an opt-in pytest-benchmark test
+(run it with '-m benchmark'), so the default run only pays for the canary.
 """
 
 import pytest
-import time
 from ProducerConsumer.core import SimulationManager
 
 # Enforce a strict 5-second timeout. 
 # If the simulation takes longer, it's likely deadlocked or horribly inefficient.
 @pytest.mark.timeout(5)
-def test_performance_large_dataset():
+def test_perf_deadlock_canary():
     """
     Verify processing 1000 items completes within 5 seconds.
     
@@ -19,15 +21,21 @@ def test_performance_large_dataset():
     1. Threads are actually running in parallel (or effectively context switching).
     2. No thread is getting stuck waiting for a signal that never comes (Deadlock).
     """
-    start_time = time.perf_counter()
-    
     n_items = 1000
     capacity = 50
     manager = SimulationManager(n_items, capacity)
     results = manager.run()
     
-    end_time = time.perf_counter()
-    duration = end_time - start_time
-    
     assert len(results) == n_items
-    print(f"\nProcessed {n_items} items in {duration:.4f} seconds")
+
+@pytest.mark.benchmark(group="simulation")
+def test_perf_benchmark(benchmark):
+    """
+    Measure a full 1000-item run with pytest-benchmark (opt-in: '-m benchmark').
+    
+    pytest-benchmark handles warm-up, repetitions and statistics, replacing the
+    single ad-hoc perf_counter() reading the canary used to print.
+    """
+    manager = SimulationManager(1000, 50)
+    results = benchmark(manager.run)
+    assert len(results) == 1000
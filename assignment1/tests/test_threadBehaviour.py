@@ -3,8 +3,9 @@
 import pytest
 import logging
 import sys
+import threading
 from io import StringIO
-from ProducerConsumer.core import SimulationManager
+from ProducerConsumer.core import STOP_SIGNAL, SimulationManager
 from ProducerConsumer.utils import LogCaptureHandler, setup_logging
 
 def test_small_capacity_blocking():
@@ -28,17 +29,55 @@ def test_thread_names(caplog):
 
 def test_stop_signal_handling(caplog):
     """Verify STOP_SIGNAL is properly handled."""
-    caplog.set_level(logging.INFO)
-    
     manager = SimulationManager(number_of_items=5, queue_capacity=3)
-    manager.run()
     
-    # Check for STOP_SIGNAL messages
-    messages = [record.getMessage() for record in caplog.records]
-    stop_signal_received = any("STOP_SIGNAL" in msg and "Received" in msg for msg in messages)
+    # at_level() only enables INFO on the simulation's logger; the filter is
+    # what keeps other loggers (whose msg may not be a str) and non-STOP lines
+    # out of caplog.records
+    def _stops_only(record):
+        return (record.name.startswith("ProducerConsumer")
+                and isinstance(record.msg, str) and "STOP_SIGNAL" in record.msg)
+    
+    caplog.handler.addFilter(_stops_only)
+    try:
+        with caplog.at_level(logging.INFO, logger="ProducerConsumer"):
+            manager.run()
+    finally:
+        caplog.handler.removeFilter(_stops_only)
+    
+    # Check for STOP_SIGNAL messages; the template in record.msg already holds the
+    # text, so nothing is formatted and any() stops at the first hit
+    stop_signal_received = any("Received STOP_SIGNAL" in record.msg for record in caplog.records)
     
     assert stop_signal_received, "STOP_SIGNAL not received by consumer"
 
+def test_log_level_above_info_skips_trace(caplog):
+    """With log_level=WARNING the threads record no trace, but results are unchanged."""
+    caplog.set_level(logging.INFO)
+    
+    manager = SimulationManager(20, 3, num_producers=2, num_consumers=2, log_level=logging.WARNING)
+    results = manager.run()
+    
+    assert [item.item_id for item in results] == list(range(1, 21))
+    assert caplog.records == []
+
+def test_multiple_producers_and_consumers(caplog):
+    """Verify every requested producer/consumer thread runs and each consumer gets its own STOP_SIGNAL."""
+    caplog.set_level(logging.INFO)
+    
+    manager = SimulationManager(number_of_items=40, queue_capacity=4, num_producers=3, num_consumers=4)
+    results = manager.run()
+    
+    assert [item.item_id for item in results] == list(range(1, 41))
+    assert manager.items_consumed == 40
+    
+    thread_names = {record.threadName for record in caplog.records}
+    assert {"Producer-1", "Producer-2", "Producer-3"} <= thread_names
+    assert {"Consumer-1", "Consumer-2", "Consumer-3", "Consumer-4"} <= thread_names
+    
+    stops = [record.threadName for record in caplog.records if "Received STOP_SIGNAL" in record.getMessage()]
+    assert sorted(stops) == ["Consumer-1", "Consumer-2", "Consumer-3", "Consumer-4"]
+
 def test_thread_lifecycle():
     """Verify threads start, execute, and terminate correctly."""
     manager = SimulationManager(number_of_items=10, queue_capacity=5)
@@ -52,21 +91,38 @@ def test_thread_lifecycle():
 
 def test_multiple_runs_reusability():
     """Test that SimulationManager can be reused for multiple runs."""
-    manager = SimulationManager(number_of_items=5, queue_capacity=3)
+    # Reuse is a structural property, so a tiny workload is enough
+    manager = SimulationManager(number_of_items=3, queue_capacity=3)
     
-    # First run
-    results1 = manager.run()
-    assert len(results1) == 5
+    # First run: snapshot the ids, since run() returns (and later clears)
+    # the manager's own destination_data list
+    first_ids = [item.item_id for item in manager.run()]
+    assert first_ids == [1, 2, 3]
     
-    # Clear destination for second run
-    manager.destination_data.clear()
-    
-    # Second run (reuse same manager)
+    # Second run (reuse same manager; run() resets its own state)
     results2 = manager.run()
-    assert len(results2) == 5
     
-    # Both runs should produce same results
-    assert [item.item_id for item in results1] == [item.item_id for item in results2]
+    # Both runs should produce same results, without carrying over the first
+    assert [item.item_id for item in results2] == first_ids
+
+def test_keep_workers_reuses_threads_across_runs(caplog):
+    """With keep_workers, repeated runs reuse the same OS threads until close()."""
+    caplog.set_level(logging.INFO)
+    
+    with SimulationManager(30, 4, num_producers=2, num_consumers=3, keep_workers=True) as manager:
+        manager.run()
+        first_idents = {record.threadName: record.thread for record in caplog.records}
+        caplog.clear()
+        
+        results = manager.run()
+        assert [item.item_id for item in results] == list(range(1, 31))
+        second_idents = {record.threadName: record.thread for record in caplog.records}
+        assert second_idents == first_idents
+        assert len(first_idents) == 5
+        pool = manager._pool
+    
+    assert manager._pool is None
+    assert not any(worker._thread.is_alive() for worker in pool)
 
 def test_consumer_waiting_on_empty_queue():
     """Verify consumer blocks when queue is empty."""
@@ -86,13 +142,15 @@ def test_producer_blocking_when_full():
 
 def test_no_race_conditions_destination():
     """Verify no race conditions in destination list (single consumer)."""
-    # Run multiple times to check for race conditions
-    for _ in range(5):
-        manager = SimulationManager(number_of_items=10, queue_capacity=3)
-        results = manager.run()
-        # Check for duplicates (race condition indicator)
-        item_ids = [item.item_id for item in results]
-        assert len(item_ids) == len(set(item_ids)), "Race condition detected: duplicate items"
+    # Race exposure grows with the number of hand-offs, not the number of runs:
+    # one 50-item run through a small buffer covers what 5 x 10 items did,
+    # while paying thread startup only once.
+    manager = SimulationManager(number_of_items=50, queue_capacity=3)
+    results = manager.run()
+    # Check for duplicates (race condition indicator)
+    item_ids = [item.item_id for item in results]
+    assert len(item_ids) == 50
+    assert len(item_ids) == len(set(item_ids)), "Race condition detected: duplicate items"
 
 # Logging and utilities tests
 def test_log_capture_handler_functionality():
@@ -120,17 +178,66 @@ def test_timestamp_ordering_correctness(caplog):
         root_logger.removeHandler(handler)
     
     handler = setup_logging()
-    manager = SimulationManager(5, 3)
+    manager = SimulationManager(20, 3, num_producers=2, num_consumers=2)
     manager.run()
     
-    sorted_logs = handler.get_sorted_logs()
-    
-    # Verify timestamps are in ascending order
-    for i in range(len(sorted_logs) - 1):
-        assert sorted_logs[i].created <= sorted_logs[i + 1].created, (
-            f"Logs not in timestamp order: {i} has timestamp {sorted_logs[i].created}, "
-            f"{i+1} has {sorted_logs[i+1].created}"
+    # Check the merged stream the CLI prints and saves, across all threads:
+    # neither the monotonic stamp nor the wall-clock 'created' may step back
+    merged = handler.get_sorted_logs()
+    assert len(merged) == len(handler.captured_logs)
+    for earlier, later in zip(merged, merged[1:]):
+        assert earlier._pc_ns <= later._pc_ns, "Logs not in timestamp order"
+        assert earlier.created <= later.created, (
+            f"Wall-clock time goes backwards: {earlier.getMessage()!r} -> {later.getMessage()!r}"
         )
+    assert handler.is_monotone()
+
+def test_sorted_logs_use_monotonic_stamp_not_wall_clock():
+    """Records sharing a wall-clock 'created' still sort in the order they were captured."""
+    handler = LogCaptureHandler()
+    logger = logging.getLogger("test_monotonic")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    
+    logger.info("first")
+    logger.info("second")
+    logger.removeHandler(handler)
+    
+    first, second = handler.captured_logs
+    second.created = first.created  # Simulate a coarse clock tick
+    assert first._pc_ns < second._pc_ns
+    assert [r.getMessage() for r in handler.get_sorted_logs()] == ["first", "second"]
+
+def test_is_monotone_detects_out_of_order_capture():
+    """is_monotone() reports merged output whose wall-clock time steps back."""
+    handler = LogCaptureHandler()
+    logger = logging.getLogger("test.monotone")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.info("first")
+    logger.info("second")
+    logger.removeHandler(handler)
+    
+    assert handler.is_monotone()
+    assert [r.getMessage() for r in handler.get_records()] == ["first", "second"]
+    first, second = handler.captured_logs
+    second.created = first.created - 1
+    assert not handler.is_monotone()
+
+def test_log_handler_keeps_out_of_order_records_sorted():
+    """A record stamped before its predecessor is inserted in place, so reads need no sort."""
+    handler = LogCaptureHandler()
+    logger = logging.getLogger("test.insort")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.info("live")
+    late = logger.makeRecord(logger.name, logging.INFO, "(unknown file)", 0, "replayed", None, None)
+    late._pc_ns = handler.captured_logs[0]._pc_ns - 1
+    logger.handle(late)
+    logger.removeHandler(handler)
+    
+    assert [r.getMessage() for r in handler.captured_logs] == ["replayed", "live"]
+    assert [r.getMessage() for r in handler.get_sorted_logs()] == ["replayed", "live"]
 
 def test_log_format_consistency(caplog):
     """Verify log format is consistent."""
@@ -140,12 +247,40 @@ def test_log_format_consistency(caplog):
     manager.run()
     
     # Check log format: [threadName] - levelname - message
-    for record in caplog.records:
-        if record.levelname == "INFO":
-            # Format should be consistent
-            assert hasattr(record, 'threadName')
-            assert hasattr(record, 'levelname')
-            assert hasattr(record, 'message')
+    # Format should be consistent; all() stops at the first bad record
+    assert all(
+        hasattr(record, 'threadName') and hasattr(record, 'levelname') and hasattr(record, 'message')
+        for record in caplog.records if record.levelname == "INFO"
+    )
+
+def test_trace_records_defer_formatting(caplog):
+    """Replayed records carry a %-style template plus args, rendered only on demand."""
+    caplog.set_level(logging.INFO)
+    
+    SimulationManager(12, 3).run()
+    
+    produced = [r for r in caplog.records if r.args and r.msg.startswith("%s WorkItem")]
+    assert len(produced) == 24  # 12 produced + 12 consumed
+    messages = [r.getMessage() for r in produced]
+    assert "Produced WorkItem(id=1)   |  Buffer: 0 -> 1" in messages
+    assert any(m.startswith("Consumed WorkItem(id=12)  |  Buffer: ") for m in messages)
+
+def test_replayed_records_keep_time_fields_consistent(caplog):
+    """Replayed records restamp relativeCreated with created, so %(relativeCreated)d matches %(asctime)s."""
+    caplog.set_level(logging.INFO)
+    
+    SimulationManager(6, 3).run()
+    logging.getLogger("test.live").info("live")
+    
+    *replayed, live = caplog.records
+    assert live.getMessage() == "live" and replayed
+    for record in replayed:
+        # Compared against a record stamped live by logging itself, so the
+        # check does not depend on how relativeCreated is derived
+        assert live.relativeCreated - record.relativeCreated == pytest.approx(
+            (live.created - record.created) * 1000, abs=1e-3
+        )
+        assert record.msecs == pytest.approx((record.created - int(record.created)) * 1000)
 
 def test_silent_capture_no_console_output():
     """Verify logs are captured silently (no console output during simulation)."""
@@ -185,3 +320,56 @@ def test_log_handler_clear_logs():
     handler.clear_logs()
     assert len(handler.captured_logs) == 0
 
+
+def test_log_handler_merges_records_from_all_threads():
+    """Records captured on different threads are merged into one ordered view."""
+    handler = LogCaptureHandler()
+    logger = logging.getLogger("test.per_thread")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    
+    def log_many(tag):
+        for i in range(50):
+            logger.info("%s-%d", tag, i)
+    
+    threads = [threading.Thread(target=log_many, args=(tag,)) for tag in "abc"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    logger.removeHandler(handler)
+    
+    sorted_logs = handler.get_sorted_logs()
+    assert len(sorted_logs) == 150
+    stamps = [record._pc_ns for record in sorted_logs]
+    assert stamps == sorted(stamps)
+    for tag in "abc":
+        assert [r.getMessage() for r in sorted_logs if r.args[0] == tag] == [f"{tag}-{i}" for i in range(50)]
+
+def test_last_producer_posts_stop_signals(caplog):
+    """The STOP signals come from the last producer thread, right after its final batch."""
+    caplog.set_level(logging.INFO)
+    
+    manager = SimulationManager(90, 5, num_producers=3, num_consumers=2)
+    # Record which thread posts each STOP: a manager that joined the
+    # producers and then posted from the main thread would also order the
+    # log lines below correctly, so only this pins down who sends them
+    stop_posters = []
+    put = manager.queue.put
+    def _recording_put(item):
+        if item is STOP_SIGNAL:
+            stop_posters.append(threading.current_thread().name)
+        put(item)
+    manager.queue.put = _recording_put
+    assert len(manager.run()) == 90
+    
+    assert len(stop_posters) == 2
+    assert all(name.startswith("Producer-") for name in stop_posters), stop_posters
+    assert len(set(stop_posters)) == 1  # one (the last) producer posts them all
+    
+    # Every STOP is consumed after the last "Finished production" line
+    messages = [(r.threadName, r.getMessage()) for r in caplog.records]
+    finished = [i for i, (_, msg) in enumerate(messages) if msg == "Finished production"]
+    stops = [i for i, (_, msg) in enumerate(messages) if msg.startswith("Received STOP_SIGNAL")]
+    assert len(finished) == 3 and len(stops) == 2
+    assert min(stops) > max(finished)
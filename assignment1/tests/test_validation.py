@@ -1,106 +1,132 @@
-"""Tests for input validation and CLI functionality."""
+"""Tests for input validation, CLI functionality and the WorkItem model."""
 
-import pytest
+import os
+import subprocess
 import sys
-from unittest.mock import patch
+
+import pytest
 from ProducerConsumer.core import SimulationManager
+from ProducerConsumer.core_async import AsyncSimulationManager
 from ProducerConsumer.cli import parse_args, get_valid_input
+from ProducerConsumer.models import WorkItem
+
+# Cycle-free tests: run the module with the cyclic GC off (see conftest.py)
+pytestmark = pytest.mark.usefixtures("no_gc")
+
+@pytest.mark.parametrize("items, cap, kwargs, exc, msg", [
+    (10, 0, {}, ValueError, "queue_capacity must be greater than 0"),
+    (10, -1, {}, ValueError, "queue_capacity must be greater than 0"),
+    (0, 10, {}, ValueError, "number_of_items must be greater than 0"),
+    (-5, 10, {}, ValueError, "number_of_items must be greater than 0"),
+    ("10", 10, {}, TypeError, "number_of_items must be an integer"),
+    (10, "10", {}, TypeError, "queue_capacity must be an integer"),
+    (10, 10, {"backend": "greenlets"}, ValueError, "backend must be one of"),
+    (10, 10, {"backend": "multiprocessing", "keep_workers": True}, ValueError,
+     "keep_workers is not supported by the multiprocessing backend"),
+    (10, 10, {"backend": "multiprocessing", "bounded": False}, ValueError,
+     "bounded=False is not supported by the multiprocessing backend"),
+], ids=["zero_capacity", "negative_capacity", "zero_items", "negative_items",
+        "str_items", "str_capacity", "unknown_backend", "mp_keep_workers", "mp_unbounded"])
+def test_constructor_rejects_bad_inputs(items, cap, kwargs, exc, msg):
+    """Counts must be positive integers, the backend a known one, and its options supported."""
+    with pytest.raises(exc, match=msg):
+        SimulationManager(number_of_items=items, queue_capacity=cap, **kwargs)
+
+@pytest.mark.parametrize("kwargs, msg", [
+    ({"keep_workers": True}, "keep_workers is not supported"),
+    ({"backend": "multiprocessing"}, "backend is not supported"),
+], ids=["keep_workers", "multiprocessing_backend"])
+def test_async_manager_rejects_thread_only_options(kwargs, msg):
+    """AsyncSimulationManager refuses options it would otherwise silently ignore."""
+    with pytest.raises(ValueError, match=msg):
+        AsyncSimulationManager(number_of_items=10, queue_capacity=10, **kwargs)
+
+def test_async_manager_builds_no_thread_buffer():
+    """The asyncio manager builds its queue per run, so no thread buffer is allocated."""
+    assert AsyncSimulationManager(10, 4).queue is None
+    manager = AsyncSimulationManager(10, 4, bounded=False)
+    assert manager.queue is None
+    assert [item.item_id for item in manager.run()] == list(range(1, 11))
+
+def test_large_values_smoke():
+    """Run the large-input path at a size cheap enough for every run."""
+    manager = SimulationManager(number_of_items=1000, queue_capacity=100)
+    results = manager.run()
+    assert len(results) == 1000
 
-def test_zero_capacity_error():
-    """Queue capacity must be > 0."""
-    with pytest.raises(ValueError, match="queue_capacity must be greater than 0"):
-        SimulationManager(number_of_items=10, queue_capacity=0)
-
-def test_negative_capacity_error():
-    """Queue capacity cannot be negative."""
-    with pytest.raises(ValueError, match="queue_capacity must be greater than 0"):
-        SimulationManager(number_of_items=10, queue_capacity=-1)
-
-def test_zero_items_error():
-    """Number of items must be > 0."""
-    with pytest.raises(ValueError, match="number_of_items must be greater than 0"):
-        SimulationManager(number_of_items=0, queue_capacity=10)
-
-def test_negative_items_error():
-    """Number of items cannot be negative."""
-    with pytest.raises(ValueError, match="number_of_items must be greater than 0"):
-        SimulationManager(number_of_items=-5, queue_capacity=10)
-
-def test_invalid_type_error():
-    """Inputs must be integers."""
-    with pytest.raises(TypeError):
-        SimulationManager(number_of_items="10", queue_capacity=10)
-    with pytest.raises(TypeError):
-        SimulationManager(number_of_items=10, queue_capacity="10")
-
+@pytest.mark.slow
 def test_max_boundary_values():
-    """Test maximum boundary values (100000 items, 10000 capacity)."""
+    """Test maximum boundary values (100000 items, 10000 capacity); run with '-m slow'."""
     manager = SimulationManager(number_of_items=100000, queue_capacity=10000)
-    results = manager.run()
-    assert len(results) == 100000
+    # Only the count matters: don't keep a name on the 100k results, and drop
+    # the manager (which owns them and the id slots) before teardown.
+    assert len(manager.run()) == 100000
+    assert manager.items_consumed == 100000
+    del manager
 
 # CLI functionality tests
-def test_argument_parsing_items():
-    """Test --items argument parsing."""
-    with patch('sys.argv', ['main.py', '--items', '50', '--capacity', '10']):
-        args = parse_args()
-        assert args.items == 50
-        assert args.capacity == 10
-
-def test_argument_parsing_capacity():
-    """Test --capacity argument parsing."""
-    with patch('sys.argv', ['main.py', '--items', '100', '--capacity', '20']):
-        args = parse_args()
-        assert args.items == 100
-        assert args.capacity == 20
-
-def test_get_valid_input_within_range():
-    """Test get_valid_input with valid input within range."""
-    with patch('builtins.input', return_value='50'):
-        with patch('sys.stdin.isatty', return_value=True):
-            result = get_valid_input("Enter items", min_value=1, max_value=100)
-            assert result == 50
-
-def test_get_valid_input_below_min():
-    """Test get_valid_input with input below minimum."""
-    with patch('builtins.input', side_effect=['0', '10']):
-        with patch('sys.stdin.isatty', return_value=True):
-            with patch('builtins.print'):  # Suppress error messages
-                result = get_valid_input("Enter items", min_value=1, max_value=100)
-                assert result == 10
-
-def test_get_valid_input_above_max():
-    """Test get_valid_input with input above maximum."""
-    with patch('builtins.input', side_effect=['200', '50']):
-        with patch('sys.stdin.isatty', return_value=True):
-            with patch('builtins.print'):  # Suppress error messages
-                result = get_valid_input("Enter items", min_value=1, max_value=100)
-                assert result == 50
-
-def test_get_valid_input_invalid_type():
-    """Test get_valid_input with invalid input type."""
-    with patch('builtins.input', side_effect=['abc', '25']):
-        with patch('sys.stdin.isatty', return_value=True):
-            with patch('builtins.print'):  # Suppress error messages
-                result = get_valid_input("Enter items", min_value=1, max_value=100)
-                assert result == 25
-
-def test_range_validation_items():
-    """Test range validation for items (1-100000)."""
-    with patch('sys.argv', ['main.py', '--items', '0', '--capacity', '10']):
-        with patch('builtins.print'):  # Suppress output
-            args = parse_args()
-            assert args.items == 0  # Parser accepts it, validation happens later
-
-def test_range_validation_capacity():
-    """Test range validation for capacity (1-10000)."""
-    with patch('sys.argv', ['main.py', '--items', '10', '--capacity', '0']):
-        with patch('builtins.print'):  # Suppress output
-            args = parse_args()
-            assert args.capacity == 0  # Parser accepts it, validation happens later
-
-def test_non_interactive_mode():
+# Argument lists go straight to parse_args(argv), which reuses the parser built
+# at import. Process-global state (input, the interactive flag) is swapped with
+# monkeypatch: a plain setattr undone at teardown, with no mock objects. The
+# interactive flag comes from the interactive_stdin fixture in conftest.py. The
+# prompts' error messages go to capsys, where the tests can also check them.
+@pytest.mark.parametrize("items, cap", [
+    (50, 10),
+    (100, 20),
+    (0, 10),   # Out-of-range values are accepted here;
+    (10, 0),   # run_simulation() checks the ranges
+    (-1, 10),  # after parsing
+])
+def test_argument_parsing(items, cap):
+    """--items/--capacity reach the namespace as ints, in range or not."""
+    args = parse_args(['--items', str(items), '--capacity', str(cap)])
+    assert (args.items, args.capacity) == (items, cap)
+
+@pytest.mark.parametrize("inputs, expected, errors", [
+    (['50'], 50, ""),
+    (['0', '10'], 10, "Error: Value must be at least 1.\n"),
+    (['200', '50'], 50, "Error: Value must be at most 100.\n"),
+    (['abc', '25'], 25, "Error: Invalid input. Please enter a number.\n"),
+], ids=["within_range", "below_min", "above_max", "invalid_type"])
+def test_get_valid_input(monkeypatch, capsys, interactive_stdin, inputs, expected, errors):
+    """get_valid_input re-prompts after each rejected answer and returns the first valid one."""
+    responses = iter(inputs)
+    monkeypatch.setattr('builtins.input', lambda prompt='': next(responses))
+    result = get_valid_input("Enter items", min_value=1, max_value=100)
+    assert result == expected
+    assert capsys.readouterr().out == errors
+
+def test_cli_imports_without_stdin():
+    """Importing the CLI must not fail when sys.stdin is None (pythonw, some services)."""
+    code = "import sys; sys.stdin = None; import ProducerConsumer.cli as cli; print(cli._INTERACTIVE)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "False"
+
+def test_non_interactive_mode(monkeypatch):
     """Test non-interactive mode behavior."""
-    with patch('sys.stdin.isatty', return_value=False):
-        with pytest.raises(EOFError, match="Interactive input not available"):
-            get_valid_input("Enter items", min_value=1, max_value=100)
+    monkeypatch.setattr('ProducerConsumer.cli._INTERACTIVE', False)
+    with pytest.raises(EOFError, match="Interactive input not available"):
+        get_valid_input("Enter items", min_value=1, max_value=100)
+
+# WorkItem model tests
+@pytest.fixture(scope="module")
+def item():
+    """One WorkItem shared by the module; it is immutable, so sharing is safe."""
+    return WorkItem(item_id=1)
+
+@pytest.mark.parametrize("check", [
+    lambda w: w.item_id == 1,
+    lambda w: repr(w) == "WorkItem(id=1, seq=0)",
+    lambda w: w == WorkItem(item_id=1),
+    lambda w: w != WorkItem(item_id=2),
+], ids=["creation", "repr", "equal", "not_equal"])
+def test_workitem_contract(item, check):
+    """Creation, string representation and equality of a WorkItem."""
+    assert check(item)
+
+def test_workitem_immutability(item):
+    """Test that WorkItem is immutable (NamedTuple fields are read-only)."""
+    with pytest.raises(AttributeError):
+        item.item_id = 10